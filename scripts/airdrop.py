@@ -0,0 +1,118 @@
+import os
+import csv
+import json
+from collections import deque
+
+
+def iter_recipients(path):
+    """
+    Stream (row, address, amount) tuples from a recipients file without
+    loading it into memory. `row` is the 1-based data row number and is what
+    checkpoints refer to.
+
+    .jsonl / .json files hold one {"address": ..., "amount": ...} object per
+    line; anything else is read as CSV with address,amount columns and an
+    optional header line.
+    """
+    if path.endswith((".jsonl", ".json")):
+        with open(path, "r") as f:
+            row = 0
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                row += 1
+                try:
+                    item = json.loads(line)
+                    yield row, str(item.get("address", "")), str(item.get("amount", ""))
+                except (ValueError, AttributeError):
+                    yield row, "", ""
+        return
+
+    with open(path, "r", newline="") as f:
+        row = 0
+        for fields in csv.reader(f):
+            if not fields or fields[0].strip().startswith("#"):
+                continue
+            address = fields[0].strip()
+            amount = fields[1].strip() if len(fields) > 1 else ""
+            if row == 0 and not address.lower().startswith("0x") and not amount.isdigit():
+                continue  # header line
+            row += 1
+            yield row, address, amount
+
+
+class Checkpoint:
+    """
+    Append-only progress log for a bulk run. Every row that was sent (or
+    rejected as invalid) is written as one JSON line, so an interrupted run
+    can resume without sending any row twice.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        self.done.add(json.loads(line)["row"])
+                    except (ValueError, KeyError):
+                        continue  # partially written last line
+        self._file = open(path, "a")
+
+    def record(self, row, **fields):
+        self._file.write(json.dumps(dict(row=row, **fields)) + "\n")
+        self._file.flush()
+        self.done.add(row)
+
+    def close(self):
+        self._file.close()
+
+
+def run_bulk(path, normalize, send, wait, checkpoint_path=None, window=16, progress_every=100):
+    """
+    Send one transaction per recipients-file row.
+
+    normalize(address) returns a checksum address or None, send(address, amount)
+    broadcasts and returns the tx hash, and wait(tx_hash) blocks until it is
+    mined. At most `window` transactions are left unconfirmed at any time.
+    Returns a dict with sent / skipped / invalid / failed counts.
+    """
+    checkpoint = Checkpoint(checkpoint_path or path + ".checkpoint")
+    stats = {"sent": 0, "skipped": 0, "invalid": 0, "failed": 0}
+    in_flight = deque()
+    try:
+        for row, address, amount in iter_recipients(path):
+            if row in checkpoint.done:
+                stats["skipped"] += 1
+                continue
+
+            recipient = normalize(address)
+            if recipient is None or not amount.isdigit() or int(amount) <= 0:
+                print(f"[!] Row {row}: invalid address or amount ({address}, {amount})")
+                checkpoint.record(row, error="invalid")
+                stats["invalid"] += 1
+                continue
+
+            try:
+                tx_hash = send(recipient, int(amount))
+            except Exception as e:
+                # Not checkpointed: the row is retried on the next run.
+                print(f"[!] Row {row}: {e}")
+                stats["failed"] += 1
+                continue
+            checkpoint.record(row, tx=tx_hash)
+            stats["sent"] += 1
+            in_flight.append(tx_hash)
+
+            if len(in_flight) >= window:
+                wait(in_flight.popleft())
+            if stats["sent"] % progress_every == 0:
+                print(f"[+] {stats['sent']} transactions sent (row {row})")
+
+        while in_flight:
+            wait(in_flight.popleft())
+    finally:
+        checkpoint.close()
+    return stats
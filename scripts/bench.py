@@ -0,0 +1,279 @@
+"""
+Benchmarks for deploy.py against a local anvil node.
+
+Runs entirely offline in a throw-away workspace: a temporary directory with
+the repository's foundry.toml and lib/ linked in, its own registry and
+contracts/, and an anvil node on a free local port. Results are written as
+JSON so two runs can be compared with --compare.
+
+    python3 scripts/bench.py --out bench.json
+    python3 scripts/bench.py --out new.json --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPTS_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+
+import deploy  # noqa: E402
+
+# anvil's first default dev account, funded on every fresh node.
+ANVIL_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+ANVIL_CHAIN_ID = 31337
+
+# Metrics where a larger value is better; everything else is a duration.
+HIGHER_IS_BETTER = ("tps",)
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 3),
+    }
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_anvil():
+    port = free_port()
+    proc = subprocess.Popen(["anvil", "--port", str(port), "--chain-id", str(ANVIL_CHAIN_ID), "--silent"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc, url
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("anvil did not start")
+
+
+def make_workspace():
+    workspace = tempfile.mkdtemp(prefix="deploy-bench-")
+    shutil.copy(os.path.join(REPO_DIR, "foundry.toml"), workspace)
+    if os.path.exists(os.path.join(REPO_DIR, "lib")):
+        os.symlink(os.path.join(REPO_DIR, "lib"), os.path.join(workspace, "lib"))
+    return workspace
+
+
+def bench_startup(runs):
+    """
+    Wall time of a fresh interpreter importing deploy.py, and of a full CLI start.
+    """
+    env = dict(os.environ, DEPLOY_QUIET="1")
+    imports, cli = [], []
+    for _ in range(runs):
+        imports.append(timed(subprocess.run, [sys.executable, "-c", "import deploy"],
+                             cwd=SCRIPTS_DIR, env=env, check=True)[0])
+        cli.append(timed(subprocess.run, [sys.executable, os.path.join(SCRIPTS_DIR, "deploy.py"), "--help"],
+                         env=env, stdout=subprocess.DEVNULL, check=True)[0])
+    return {"import": summarize(imports), "cli_help": summarize(cli)}
+
+
+def bench_build(runs):
+    results = {"generate": summarize([timed(deploy.generate_contract, f"BenchToken{i}", "BNCH")[0]
+                                      for i in range(runs)])}
+    shutil.rmtree("out", ignore_errors=True)
+    results["compile_cold_s"] = round(timed(deploy.compile_contract)[0], 3)
+    deploy.generate_contract("BenchTokenNew", "BNCH")
+    results["compile_incremental_s"] = round(timed(deploy.compile_contract)[0], 3)
+    results["compile_cached"] = summarize([timed(deploy.compile_contract)[0] for _ in range(runs)])
+    return results
+
+
+def bench_deploy(rpc_url, runs):
+    native = [timed(deploy.deploy_contract, rpc_url, ANVIL_KEY, "BenchToken0", chain_id=ANVIL_CHAIN_ID)
+              for _ in range(runs)]
+    if not all(address for _, address in native):
+        raise RuntimeError("native deployment failed")
+    forge = [timed(deploy.deploy_contract_forge, rpc_url, ANVIL_KEY, "BenchToken0")[0] for _ in range(max(1, runs // 2))]
+    return {"native": summarize([t for t, _ in native]), "forge": summarize(forge)}, native[0][1]
+
+
+def bench_transactions(rpc_url, contract_address, count, window):
+    """
+    Throughput of the bulk mint and transfer paths, measured until every
+    transaction is mined.
+    """
+    w3, acct = deploy.init_web3(rpc_url, ANVIL_KEY)
+    recipients = os.path.abspath("recipients.csv")
+    with open(recipients, "w") as f:
+        for i in range(count):
+            f.write(f"0x{i + 1:040x},1\n")
+
+    results = {}
+    for action in ("mint", "transfer"):
+        if action == "transfer":
+            deploy.mint_tokens(w3, acct, ANVIL_CHAIN_ID, contract_address, ANVIL_KEY, acct.address, str(count * 10))
+        checkpoint = f"{recipients}.{action}.checkpoint"
+        seconds, stats = timed(deploy.bulk_send, w3, acct, ANVIL_CHAIN_ID, contract_address, ANVIL_KEY,
+                               recipients, action, window, checkpoint)
+        results[action] = {"transactions": stats["sent"], "seconds": round(seconds, 3),
+                           "tps": round(stats["sent"] / seconds, 2) if seconds else None}
+    return results
+
+
+def bench_codec(rows, runs):
+    """
+    Calldata for `rows` transfer payloads through the bulk encoder.
+    """
+    codec = deploy.token_codec()
+    addresses = [f"0x{i + 1:040x}" for i in range(rows)]
+    amounts = [(i + 1) * 10**18 for i in range(rows)]
+    samples = [timed(codec.encode_rows, "transfer", addresses, amounts)[0] for _ in range(runs)]
+    return {"rows": rows, "encode_rows": summarize(samples)}
+
+
+def bench_registry(sizes):
+    results = {}
+    deployer = "0x" + "11" * 20
+    for size in sizes:
+        deploy._REGISTRY = None
+        deploy.REGISTRY_FILE = os.path.abspath(f"registry-{size}.db")
+        write, _ = timed(lambda: [deploy.store_contract_info(f"chain{i % 5}", f"Token{i}", f"0x{i:040x}",
+                                                             deployer if i % 10 == 0 else f"0x{i % 97:040x}")
+                                  for i in range(size)])
+        reads = [timed(deploy.list_contract_info, f"chain{i % 5}", deployer)[0] for i in range(20)]
+        updates = [timed(deploy.update_verification_status, "chain0", f"Token{i * 10}", f"0x{i * 10:040x}",
+                         deployer, "verified")[0] for i in range(20)]
+        results[str(size)] = {
+            "write_total_s": round(write, 3),
+            "write_per_row_us": round(write / size * 1e6, 2),
+            "list": summarize(reads),
+            "update_status": summarize(updates),
+        }
+    return results
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not name.endswith(".n"):
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline, threshold):
+    """
+    Print per-metric changes against a baseline run. Returns the list of
+    metrics that got worse by more than `threshold` (a fraction).
+    """
+    now, before = flatten(current["results"]), flatten(baseline["results"])
+    regressions = []
+    print("\n=== Comparison ===")
+    for name in sorted(set(now) & set(before)):
+        if not before[name]:
+            continue
+        change = (now[name] - before[name]) / before[name]
+        worse = -change if name.endswith(HIGHER_IS_BETTER) else change
+        mark = "!" if worse > threshold else " "
+        print(f"[{mark}] {name:<45} {before[name]:>12} -> {now[name]:>12} ({change:+.1%})")
+        if worse > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deploy.py against a local anvil node.")
+    parser.add_argument("--out", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="regression threshold for --compare (default 0.2)")
+    parser.add_argument("--runs", type=int, default=5, help="samples per timing (default 5)")
+    parser.add_argument("--txs", type=int, default=200, help="transactions per throughput test (default 200)")
+    parser.add_argument("--window", type=int, default=32, help="in-flight window for throughput tests (default 32)")
+    parser.add_argument("--rows", default="10000,100000", help="registry sizes (default 10000,100000)")
+    parser.add_argument("--codec-rows", type=int, default=100000, help="transfer payloads to encode (default 100000)")
+    args = parser.parse_args()
+    out = os.path.abspath(args.out)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                     capture_output=True, text=True).stdout.strip(),
+            "args": vars(args),
+        },
+        "results": {},
+        "errors": {},
+    }
+    results = report["results"]
+
+    def step(name, fn, *fn_args):
+        print(f"[+] Benchmark: {name}")
+        try:
+            return fn(*fn_args)
+        except Exception as e:
+            print(f"[!] {name} failed: {e}")
+            report["errors"][name] = str(e)
+            return None
+
+    results["startup"] = step("startup", bench_startup, args.runs)
+    results["codec"] = step("codec", bench_codec, args.codec_rows, args.runs)
+
+    workspace = make_workspace()
+    os.chdir(workspace)
+    deploy.REGISTRY_FILE = os.path.abspath("bench.db")
+    deploy.get_tracker().poll_interval = 0.1
+    anvil = None
+    try:
+        results["build"] = step("build", bench_build, args.runs)
+        anvil, rpc_url = start_anvil()
+        deployed = step("deploy", bench_deploy, rpc_url, args.runs)
+        if deployed:
+            results["deploy"], contract_address = deployed
+            results["transactions"] = step("transactions", bench_transactions, rpc_url, contract_address,
+                                           args.txs, args.window)
+        results["registry"] = step("registry", bench_registry, [int(r) for r in args.rows.split(",")])
+    finally:
+        if anvil:
+            anvil.terminate()
+        os.chdir(REPO_DIR)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    report["results"] = {k: v for k, v in results.items() if v is not None}
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[✓] Results written to {out}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"[!] {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+    if report["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+from decimal import Decimal, InvalidOperation, localcontext
+
+from eth_utils import keccak, to_checksum_address
+
+try:
+    import numpy
+except ImportError:  # optional, the strided bytearray path needs nothing
+    numpy = None
+
+ERROR_SELECTOR = bytes.fromhex("08c379a0")   # Error(string)
+PANIC_SELECTOR = bytes.fromhex("4e487b71")   # Panic(uint256)
+
+PANIC_CODES = {
+    0x00: "generic compiler panic",
+    0x01: "assert failed",
+    0x11: "arithmetic overflow or underflow",
+    0x12: "division or modulo by zero",
+    0x21: "invalid enum value",
+    0x22: "invalid storage byte array",
+    0x31: "pop on empty array",
+    0x32: "array index out of bounds",
+    0x41: "out of memory",
+    0x51: "call to an uninitialized function",
+}
+
+# ABI of the generated token contracts (ERC20 + Ownable from OpenZeppelin 5),
+# used when no compiled artifact is at hand.
+TOKEN_ABI = [
+    {"type": "function", "name": "mint", "inputs": [{"type": "address"}, {"type": "uint256"}], "outputs": []},
+    {"type": "function", "name": "burn", "inputs": [{"type": "uint256"}], "outputs": []},
+    {"type": "function", "name": "renounce", "inputs": [], "outputs": []},
+    {"type": "function", "name": "transfer", "inputs": [{"type": "address"}, {"type": "uint256"}], "outputs": [{"type": "bool"}]},
+    {"type": "function", "name": "totalSupply", "inputs": [], "outputs": [{"type": "uint256"}]},
+    {"type": "function", "name": "decimals", "inputs": [], "outputs": [{"type": "uint8"}]},
+    {"type": "function", "name": "owner", "inputs": [], "outputs": [{"type": "address"}]},
+    {"type": "function", "name": "balanceOf", "inputs": [{"type": "address"}], "outputs": [{"type": "uint256"}]},
+    {"type": "error", "name": "OwnableUnauthorizedAccount", "inputs": [{"type": "address"}]},
+    {"type": "error", "name": "OwnableInvalidOwner", "inputs": [{"type": "address"}]},
+    {"type": "error", "name": "ERC20InsufficientBalance", "inputs": [{"type": "address"}, {"type": "uint256"}, {"type": "uint256"}]},
+    {"type": "error", "name": "ERC20InvalidSender", "inputs": [{"type": "address"}]},
+    {"type": "error", "name": "ERC20InvalidReceiver", "inputs": [{"type": "address"}]},
+    {"type": "error", "name": "ERC20InsufficientAllowance", "inputs": [{"type": "address"}, {"type": "uint256"}, {"type": "uint256"}]},
+]
+
+
+def canonical_type(param):
+    if param["type"].startswith("tuple"):
+        inner = ",".join(canonical_type(c) for c in param["components"])
+        return f"({inner}){param['type'][5:]}"
+    return param["type"]
+
+
+def signature(item):
+    return f"{item['name']}({','.join(canonical_type(p) for p in item.get('inputs', []))})"
+
+
+def _is_static(t):
+    return t in ("address", "bool") or t.startswith(("uint", "int")) or (t.startswith("bytes") and t != "bytes")
+
+
+def _encode_word(t, value):
+    if t == "address":
+        return bytes.fromhex(value[2:]).rjust(32, b"\0")
+    if t == "bool":
+        return (1 if value else 0).to_bytes(32, "big")
+    if t.startswith("uint"):
+        return int(value).to_bytes(32, "big")
+    if t.startswith("int"):
+        return int(value).to_bytes(32, "big", signed=True)
+    return bytes(value).ljust(32, b"\0")  # bytes1..bytes32
+
+
+def _decode_word(t, word):
+    if t == "address":
+        return to_checksum_address(word[12:])
+    if t == "bool":
+        return word[-1] == 1
+    if t.startswith("uint"):
+        return int.from_bytes(word, "big")
+    if t.startswith("int"):
+        return int.from_bytes(word, "big", signed=True)
+    return bytes(word[:int(t[5:])])
+
+
+class Codec:
+    """
+    Calldata encoder / return data decoder for one contract ABI. Selectors
+    are hashed once here; encoding and decoding static argument types is
+    plain byte slicing, dynamic ones go through eth_abi.
+    """
+
+    def __init__(self, abi):
+        self.functions = {}
+        self.errors = {}
+        for item in abi:
+            if item.get("type") == "function":
+                entry = (keccak(text=signature(item))[:4],
+                         [canonical_type(p) for p in item.get("inputs", [])],
+                         [canonical_type(p) for p in item.get("outputs", [])])
+                # Overloads are reachable by full signature, the first one also by name.
+                self.functions[signature(item)] = entry
+                self.functions.setdefault(item["name"], entry)
+            elif item.get("type") == "error":
+                self.errors[keccak(text=signature(item))[:4]] = (item["name"], [canonical_type(p) for p in item["inputs"]])
+
+    def encode(self, fn, *args):
+        selector, inputs, _ = self.functions[fn]
+        if len(args) != len(inputs):
+            raise ValueError(f"{fn} takes {len(inputs)} argument(s), got {len(args)}")
+        if all(_is_static(t) for t in inputs):
+            return selector + b"".join(_encode_word(t, v) for t, v in zip(inputs, args))
+        from eth_abi import encode
+        return selector + encode(inputs, list(args))
+
+    def decode(self, fn, data):
+        """
+        Decode a call's return data. Returns a single value for one output,
+        a tuple otherwise.
+        """
+        outputs = self.functions[fn][2]
+        data = _as_bytes(data)
+        if all(_is_static(t) for t in outputs):
+            if len(data) < 32 * len(outputs):
+                raise ValueError(f"{fn}: expected {32 * len(outputs)} bytes of return data, got {len(data)}")
+            values = tuple(_decode_word(t, data[i * 32:(i + 1) * 32]) for i, t in enumerate(outputs))
+        else:
+            from eth_abi import decode
+            values = decode(outputs, data)
+        return values[0] if len(values) == 1 else values
+
+    def decode_revert(self, data):
+        """
+        Human readable revert reason from revert data: Error(string),
+        Panic(uint256) or one of the ABI's custom errors. None if there is
+        no revert data, a hex string if it is not recognised.
+        """
+        data = _as_bytes(data)
+        if len(data) < 4:
+            return None
+        selector, body = data[:4], data[4:]
+        try:
+            if selector == ERROR_SELECTOR:
+                from eth_abi import decode
+                return decode(["string"], body)[0]
+            if selector == PANIC_SELECTOR:
+                code = int.from_bytes(body[:32], "big")
+                return f"panic 0x{code:02x}: {PANIC_CODES.get(code, 'unknown panic code')}"
+            if selector in self.errors:
+                name, inputs = self.errors[selector]
+                if all(_is_static(t) for t in inputs):
+                    values = [_decode_word(t, body[i * 32:(i + 1) * 32]) for i, t in enumerate(inputs)]
+                else:
+                    from eth_abi import decode
+                    values = decode(inputs, body)
+                return f"{name}({', '.join(str(v) for v in values)})"
+        except Exception:
+            pass
+        return "0x" + data.hex()
+
+    def encode_rows(self, fn, addresses, amounts):
+        """
+        Calldata for many calls of an (address, uint256) function, e.g.
+        transfer or mint, as one preallocated buffer of 68-byte rows. Returns
+        (buffer, width); row i is buffer[i * width:(i + 1) * width].
+
+        Addresses and amounts are converted with one join each, then laid out
+        column by column (NumPy when installed, strided bytearray slices
+        otherwise), so there is no per-row hashing or concatenation.
+        """
+        selector, inputs, _ = self.functions[fn]
+        if inputs != ["address", "uint256"]:
+            raise ValueError(f"{fn} does not take (address, uint256)")
+        n = len(addresses)
+        if len(amounts) != n:
+            raise ValueError("addresses and amounts differ in length")
+        width = 4 + 64
+        address_bytes = bytes.fromhex("".join(a[2:] for a in addresses))
+        amount_bytes = b"".join(int(a).to_bytes(32, "big") for a in amounts)
+        if len(address_bytes) != 20 * n:
+            raise ValueError("every address must be 20 bytes")
+
+        if numpy is not None:
+            buf = numpy.zeros((n, width), dtype=numpy.uint8)
+            buf[:, :4] = numpy.frombuffer(selector, dtype=numpy.uint8)
+            buf[:, 16:36] = numpy.frombuffer(address_bytes, dtype=numpy.uint8).reshape(n, 20)
+            buf[:, 36:68] = numpy.frombuffer(amount_bytes, dtype=numpy.uint8).reshape(n, 32)
+            return memoryview(buf.reshape(-1)), width
+
+        buf = bytearray(n * width)
+        for i in range(4):
+            buf[i::width] = selector[i:i + 1] * n
+        for i in range(20):
+            buf[16 + i::width] = address_bytes[i::20]
+        for i in range(32):
+            buf[36 + i::width] = amount_bytes[i::32]
+        return memoryview(buf), width
+
+
+def iter_rows(buffer, width):
+    """
+    Yield each row of an encode_rows buffer as bytes.
+    """
+    for start in range(0, len(buffer), width):
+        yield bytes(buffer[start:start + width])
+
+
+def to_base_units(amount, decimals):
+    """
+    Convert a token amount as typed by a user ("1.5", "20") to the integer
+    amount in base units for a token with `decimals` decimals.
+    """
+    try:
+        value = Decimal(str(amount).strip())
+    except InvalidOperation:
+        raise ValueError(f"invalid amount '{amount}'")
+    with localcontext() as ctx:
+        ctx.prec = 100
+        scaled = value.scaleb(decimals)
+    if value <= 0 or scaled != scaled.to_integral_value():
+        raise ValueError(f"invalid amount '{amount}' for a token with {decimals} decimals")
+    return int(scaled)
+
+
+def _as_bytes(data):
+    if data is None:
+        return b""
+    if isinstance(data, str):
+        return bytes.fromhex(data[2:] if data.startswith("0x") else data)
+    return bytes(data)
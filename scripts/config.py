@@ -0,0 +1,55 @@
+import os
+import threading
+
+
+class ConfigCache:
+    """
+    Parsed config files kept in memory. A file is parsed again only when its
+    modification time or size changes, so the menus can call load_keys() and
+    load_chains() on every pass without re-reading anything.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def load(self, path, parse):
+        """
+        Return parse(file object) for path, or None if the file does not exist.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        key = (os.path.abspath(path), parse)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stamp:
+                return entry[1]
+        with open(path, "r") as f:
+            value = parse(f)
+        with self._lock:
+            self._entries[key] = (stamp, value)
+        return value
+
+
+class AccountCache:
+    """
+    eth_account Account objects per private key. Deriving the address is a
+    secp256k1 operation, so it is done once per key and process.
+    """
+
+    def __init__(self):
+        self._accounts = {}
+        self._lock = threading.Lock()
+
+    def get(self, private_key):
+        with self._lock:
+            account = self._accounts.get(private_key)
+        if account is None:
+            from eth_account import Account
+            account = Account.from_key(private_key)
+            with self._lock:
+                account = self._accounts.setdefault(private_key, account)
+        return account
@@ -0,0 +1,49 @@
+from eth_abi import encode
+from eth_utils import keccak, to_checksum_address
+
+from rpc import get_pool, RPCError
+
+# Deterministic deployment proxy (Arachnid). It has the same address on every
+# chain it is deployed to. Its calldata is a 32 byte salt followed by the init
+# code, and it deploys with CREATE2, so the address does not depend on the
+# sender's nonce.
+DETERMINISTIC_DEPLOYER = "0x4e59b44847b379578588920cA78FbF26c0B4956C"
+BATCH_SIZE = 100        # eth_getCode calls per JSON-RPC batch
+
+
+def token_salt(name, symbol, deployer):
+    """
+    CREATE2 salt of a token: keccak256(abi.encode(name, symbol, deployer)).
+    """
+    return keccak(encode(["string", "string", "address"], [name, symbol, to_checksum_address(deployer)]))
+
+
+def init_code(bytecode, types=(), args=()):
+    """
+    Creation bytecode followed by the ABI encoded constructor arguments.
+    """
+    code = bytes.fromhex(bytecode[2:] if bytecode.startswith("0x") else bytecode)
+    return code + (encode(list(types), list(args)) if types else b"")
+
+
+def create2_address(salt, code, factory=DETERMINISTIC_DEPLOYER):
+    return to_checksum_address(keccak(b"\xff" + bytes.fromhex(factory[2:]) + salt + keccak(code))[12:])
+
+
+def deploy_calldata(salt, code):
+    return "0x" + (salt + code).hex()
+
+
+def deployed(rpc_url, addresses):
+    """
+    {address: True if it has code} for every address, from eth_getCode in
+    JSON-RPC batches. An address whose lookup failed maps to None.
+    """
+    pool = get_pool(rpc_url)
+    addresses = list(dict.fromkeys(addresses))
+    out = {}
+    for i in range(0, len(addresses), BATCH_SIZE):
+        chunk = addresses[i:i + BATCH_SIZE]
+        for address, code in zip(chunk, pool.batch([("eth_getCode", [a, "latest"]) for a in chunk])):
+            out[address] = None if isinstance(code, RPCError) else code not in (None, "0x", "0x0")
+    return out
@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from eth_abi import encode, decode
+from eth_utils import keccak, to_checksum_address
+
+from rpc import get_pool, RPCError
+from metrics import labels
+from codec import Codec, TOKEN_ABI
+
+# Multicall3 has the same address on every chain it is deployed to.
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL_CHUNK = 500   # sub-calls per aggregate3 eth_call
+BATCH_SIZE = 100        # calls per JSON-RPC batch POST
+
+TOKEN = Codec(TOKEN_ABI)
+GET_ETH_BALANCE = keccak(text="getEthBalance(address)")[:4]
+AGGREGATE3 = keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+# Token reads per deployment, in the order they are decoded.
+FIELDS = ("total_supply", "decimals", "owner", "deployer_balance")
+
+
+def _address_arg(address):
+    return bytes.fromhex(address[2:]).rjust(32, b"\0")
+
+
+def token_calls(deployment):
+    token, deployer = deployment["address"], deployment["deployer"]
+    return [
+        (token, TOKEN.encode("totalSupply")),
+        (token, TOKEN.encode("decimals")),
+        (token, TOKEN.encode("owner")),
+        (token, TOKEN.encode("balanceOf", deployer)),
+    ]
+
+
+def _word(data):
+    return int.from_bytes(data[:32], "big") if data and len(data) >= 32 else None
+
+
+def decode_field(field, data):
+    value = _word(data)
+    if field == "owner" and value is not None:
+        return to_checksum_address(data[12:32])
+    return value
+
+
+def has_multicall(pool):
+    return pool.call("eth_getCode", [MULTICALL3, "latest"]) not in (None, "0x", "0x0")
+
+
+def _eth_call(to, data):
+    return ("eth_call", [{"to": to, "data": "0x" + data.hex()}, "latest"])
+
+
+def _batched(pool, calls):
+    results = []
+    for i in range(0, len(calls), BATCH_SIZE):
+        results += pool.batch(calls[i:i + BATCH_SIZE])
+    return results
+
+
+def _bytes(result):
+    if result is None or isinstance(result, RPCError):
+        return None
+    return bytes.fromhex(result[2:])
+
+
+def read_multicall(pool, calls):
+    """
+    Run [(target, calldata)] through Multicall3 aggregate3 with allowFailure
+    set, MULTICALL_CHUNK sub-calls per eth_call and every eth_call of the
+    chain in one JSON-RPC batch. Returns the return data per call, None for a
+    failed sub-call.
+    """
+    chunks = [calls[i:i + MULTICALL_CHUNK] for i in range(0, len(calls), MULTICALL_CHUNK)]
+    requests = [_eth_call(MULTICALL3, AGGREGATE3 + encode(["(address,bool,bytes)[]"], [[(t, True, d) for t, d in chunk]]))
+                for chunk in chunks]
+    out = []
+    for chunk, result in zip(chunks, _batched(pool, requests)):
+        data = _bytes(result)
+        if data is None:
+            out += [None] * len(chunk)
+            continue
+        (returned,) = decode(["(bool,bytes)[]"], data)
+        out += [payload if ok else None for ok, payload in returned]
+    return out
+
+
+def read_chain(rpc_url, deployments):
+    """
+    Read totalSupply, decimals, owner and the deployer's token balance for
+    every deployment on one chain, plus each deployer's native balance.
+    Uses Multicall3 when the chain has it, JSON-RPC batches of eth_call
+    otherwise. Returns (rows, mode).
+    """
+    pool = get_pool(rpc_url)
+    deployers = sorted({d["deployer"] for d in deployments})
+    calls = [call for d in deployments for call in token_calls(d)]
+
+    if has_multicall(pool):
+        mode = "multicall3"
+        results = read_multicall(pool, calls + [(MULTICALL3, GET_ETH_BALANCE + _address_arg(a)) for a in deployers])
+        native = [_word(r) for r in results[len(calls):]]
+    else:
+        mode = "batch"
+        results = [_bytes(r) for r in _batched(pool, [_eth_call(t, d) for t, d in calls])]
+        native = [None if isinstance(r, RPCError) or r is None else int(r, 16)
+                  for r in _batched(pool, [("eth_getBalance", [a, "latest"]) for a in deployers])]
+
+    balances = dict(zip(deployers, native))
+    rows = []
+    for i, d in enumerate(deployments):
+        values = results[i * len(FIELDS):(i + 1) * len(FIELDS)]
+        row = dict(d, **{field: decode_field(field, data) for field, data in zip(FIELDS, values)})
+        row["native_balance"] = balances.get(d["deployer"])
+        rows.append(row)
+    return rows, mode
+
+
+def read_chains(targets, max_workers=None):
+    """
+    targets: {chain name: (rpc_url, [deployment dicts])}. All chains are read
+    at the same time. Returns {chain name: {"rows", "mode", "error"}}.
+    """
+    def read(name, rpc_url, deployments):
+        with labels(chain=name):
+            return read_chain(rpc_url, deployments)
+
+    out = {}
+    if not targets:
+        return out
+    with ThreadPoolExecutor(max_workers=max_workers or len(targets)) as pool:
+        futures = {pool.submit(read, name, url, deps): name for name, (url, deps) in targets.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                rows, mode = future.result()
+                out[name] = {"rows": rows, "mode": mode, "error": None}
+            except Exception as e:
+                out[name] = {"rows": [], "mode": None, "error": str(e)}
+    return out
+
+
+def _units(value, decimals):
+    if value is None:
+        return "?"
+    decimals = 18 if decimals is None else decimals
+    whole, frac = divmod(value, 10 ** decimals)
+    frac = f"{frac:0{decimals}d}".rstrip("0")[:4] if decimals else ""
+    return f"{whole:,}.{frac}" if frac else f"{whole:,}"
+
+
+def print_dashboard(results):
+    for chain in sorted(results):
+        r = results[chain]
+        if r["error"]:
+            print(f"\n=== {chain} ===\n[!] {r['error']}")
+            continue
+        print(f"\n=== {chain} ({len(r['rows'])} tokens, via {r['mode']}) ===")
+        for row in r["rows"]:
+            if row["total_supply"] is None:
+                print(f"[!] {row['token_name']:<16} {row['address']}  no token at this address")
+                continue
+            owner = row["owner"] or "?"
+            if owner == "0x" + "0" * 40:
+                owner = "renounced"
+            elif owner.lower() == row["deployer"].lower():
+                owner = "deployer"
+            print(f"{row['token_name']:<16} {row['address']}  [{row['status']}]  supply {_units(row['total_supply'], row['decimals'])}"
+                  f"  owner {owner}  deployer holds {_units(row['deployer_balance'], row['decimals'])}"
+                  f"  native {_units(row['native_balance'], 18)}")
@@ -1,9 +1,34 @@
+import time
+_STARTED = time.perf_counter()
+
 import os
+import sys
+import json
+import glob
+import shutil
+import hashlib
+import argparse
+import threading
 import subprocess
-from web3 import Web3
-from eth_account import Account
+from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from gay import banner
-banner() 
+from nonce_manager import NonceManager
+from airdrop import run_bulk
+from gas_oracle import GasOracle, PROFILES
+from registry import Registry
+from verify_queue import VerifyQueue
+from metrics import METRICS, span, traced, labels, set_labels, bind
+from config import ConfigCache, AccountCache
+# web3, eth_account, the RPC modules (rpc, tracker, fee_bumper) and codec are imported lazily
+# by the first function that needs them, so commands that never touch an
+# RPC start without loading the web3 stack.
+
+# (phase, seconds) pairs collected during startup, printed by --startup-report.
+STARTUP_TIMINGS = [("imports", time.perf_counter() - _STARTED)]
+
+def startup_phase(name, started):
+    STARTUP_TIMINGS.append((name, time.perf_counter() - started))
 
 
 # ----------------------------------------------------------------------
@@ -24,23 +49,28 @@ def get_input(prompt, allow_back=True):
 # 2) LOAD KEY & CHAIN CONFIGS
 # ----------------------------------------------------------------------
 
+# keys.txt and chains.txt are parsed once and again only after they change;
+# derived accounts are kept for the whole session.
+CONFIG = ConfigCache()
+ACCOUNTS = AccountCache()
+
 def load_keys(filename="keys.txt"):
     """
     Load private keys from keys.txt.
     Expected format: label=private_key
     Lines starting with '#' or blank lines are ignored.
     """
-    if not os.path.exists(filename):
-        return {}
+    return dict(CONFIG.load(filename, parse_keys) or {})
+
+def parse_keys(f):
     keys = {}
-    with open(filename, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" in line:
-                label, key_value = line.split("=", 1)
-                keys[label.strip()] = key_value.strip()
+    for line in f:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if "=" in line:
+            label, key_value = line.split("=", 1)
+            keys[label.strip()] = key_value.strip()
     return keys
 
 def select_key():  
@@ -70,6 +100,7 @@ def select_key():
             if 1 <= idx <= len(key_labels):                                                             
                 selected_label = key_labels[idx - 1]
                 print(f"[✓] Selected key: {selected_label}")
+                set_labels(key=selected_label)
                 return keys[selected_label]
             else:
                 print("[!] Invalid choice. Please try again.")
@@ -81,27 +112,61 @@ def load_chains(filename="chains.txt"):
     Load chain configurations from chains.txt.
     Each chain block is separated by a blank line and must include a 'name' field.
     """
-    if not os.path.exists(filename):
-        return {}
+    return dict(CONFIG.load(filename, parse_chains) or {})
 
+def parse_chains(f):
     chains = {}
-    with open(filename, "r") as f:
-        block = {}
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                if block:
-                    if "name" in block:
-                        chains[block["name"]] = block
-                    block = {}
-                continue
-            if "=" in line:
-                key, value = line.split("=", 1)
-                block[key.strip()] = value.strip()
-        if block and "name" in block:
-            chains[block["name"]] = block
+    block = {}
+    for line in f:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            if block:
+                if "name" in block:
+                    chains[block["name"]] = block
+                block = {}
+            continue
+        if "=" in line:
+            key, value = line.split("=", 1)
+            block[key.strip()] = value.strip()
+    if block and "name" in block:
+        chains[block["name"]] = block
     return chains
 
+# RPC_URL -> chain id already confirmed against eth_chainId this session.
+_CHECKED_CHAIN_IDS = {}
+
+def check_chain_id(chain_config, reported=None):
+    """
+    Make sure every RPC endpoint behind a chain really serves CHAIN_ID from
+    chains.txt, since the pool may route any call to any of them. Each
+    endpoint is asked once per RPC_URL and session (with a single endpoint,
+    `reported` is used when the caller already fetched it). Raises ValueError
+    on a mismatch; an unreachable endpoint is checked again next time.
+    """
+    rpc_url = chain_config["RPC_URL"]
+    expected = int(chain_config["CHAIN_ID"])
+    if _CHECKED_CHAIN_IDS.get(rpc_url) == expected:
+        return
+    from rpc import get_transport, split_urls
+    urls = split_urls(rpc_url)
+    if reported is not None and len(urls) == 1:
+        answers = {urls[0]: reported}
+    else:
+        with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+            futures = {url: pool.submit(get_transport(url).call, "eth_chainId") for url in urls}
+        answers = {}
+        for url, future in futures.items():
+            try:
+                answers[url] = int(future.result(), 16)
+            except Exception as e:
+                print(f"[!] Could not check the chain id of {url}: {e}")
+    for url, chain_id in answers.items():
+        if chain_id != expected:
+            raise ValueError(f"RPC {url} reports chain id {chain_id}, chains.txt says {expected} "
+                             f"for {chain_config['name']}")
+    if len(answers) == len(urls):
+        _CHECKED_CHAIN_IDS[rpc_url] = expected
+
 def select_chain():
     """
     Display a list of chains and let the user select one.
@@ -129,6 +194,7 @@ def select_chain():
             if 1 <= idx <= len(chain_names):
                 selected_name = chain_names[idx - 1]
                 print(f"[✓] Selected chain: {selected_name}")
+                set_labels(chain=selected_name)
                 return chains[selected_name]
             else:
                 print("[!] Invalid choice. Please try again.")
@@ -147,7 +213,7 @@ import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
 import "@openzeppelin/contracts/access/Ownable.sol";
 
 contract {name} is ERC20, Ownable {{
-    constructor() ERC20("{name}", "{symbol}") Ownable(msg.sender) {{
+    constructor(address initialOwner) ERC20("{name}", "{symbol}") Ownable(initialOwner) {{
         // No tokens minted on deployment.
     }}
 
@@ -165,48 +231,355 @@ contract {name} is ERC20, Ownable {{
 }}
 '''
 
+# Parametrized variant: compiled once, name and symbol are passed to the
+# constructor at deploy time instead of being baked into the source.
+PARAM_CONTRACT_NAME = "DeployToken"
+
+PARAM_CONTRACT_TEMPLATE = '''
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import "@openzeppelin/contracts/access/Ownable.sol";
+
+contract DeployToken is ERC20, Ownable {
+    constructor(string memory name_, string memory symbol_, address initialOwner) ERC20(name_, symbol_) Ownable(initialOwner) {
+        // No tokens minted on deployment.
+    }
+
+    function mint(address to, uint256 amount) public onlyOwner {
+        _mint(to, amount * 10 ** decimals());
+    }
+
+    function burn(uint256 amount) public {
+        _burn(msg.sender, amount * 10 ** decimals());
+    }
+
+    function renounce() public onlyOwner {
+        renounceOwnership();
+    }
+}
+'''
+
+# When enabled (DEPLOY_PARAMETRIZED=1 or --parametrized) every token is deployed
+# from the shared DeployToken build, so N deployments cost a single compile.
+PARAMETRIZED_BUILD = os.environ.get("DEPLOY_PARAMETRIZED", "") == "1"
+
+BUILD_HASH_FILE = "out/.build_hash"
+TOOLCHAIN_CACHE_FILE = ".toolchain_cache.json"
+
+# Deploy from the build artifacts in-process by default; DEPLOY_WITH_FORGE=1
+# (or --forge) always shells out to forge create instead.
+DEPLOY_WITH_FORGE = os.environ.get("DEPLOY_WITH_FORGE", "") == "1"
+RECEIPT_TIMEOUT = 180
+
+# DEPLOY_CREATE2=1 (or --create2) deploys through the deterministic deployment
+# proxy with a salt from (name, symbol, deployer): addresses are known before
+# anything is sent, and a token that already exists is skipped.
+DEPLOY_CREATE2 = os.environ.get("DEPLOY_CREATE2", "") == "1"
+
+_ARTIFACT_CACHE = {}
+
+# Block of every contract deployed natively in this run, so the registry
+# knows where the Transfer indexer has to start.
+DEPLOY_BLOCKS = {}
+
+# generate_contract + compile_contract share contracts/ and out/, so
+# concurrent jobs must not interleave them.
+_BUILD_LOCK = threading.Lock()
+
+# Seconds to wait after a deployment before the first queued verification attempt.
+VERIFY_DELAY = 15
+
+# Shared by every action so transactions from the same key never reuse a nonce.
+NONCES = NonceManager()
+
+# Fees and gas limits are looked up per chain instead of being hard-coded.
+GAS = GasOracle()
+GAS_PROFILE = os.environ.get("GAS_PROFILE", "normal")
+
+# Blocks on top of a transaction before the tracker reports it final.
+CONFIRMATIONS = int(os.environ.get("CONFIRMATIONS", "1"))
+
+# Seconds a sent transaction may go without a receipt before it is replaced
+# with bumped fees (0 = never), and the highest max fee / gas price in gwei a
+# replacement may pay (0 = a multiple of the first fee, see fee_bumper.py).
+BUMP_AFTER = float(os.environ.get("BUMP_AFTER", "0"))
+FEE_CEILING_GWEI = float(os.environ.get("FEE_CEILING_GWEI", "0"))
+
+# Deployments live in an SQLite registry; the old flat file is only read
+# once to import its rows.
+REGISTRY_FILE = "contract_info.db"
 CONTRACT_INFO_FILE = "contract_info.txt"
 
 # ----------------------------------------------------------------------
 # 4) DEPLOYMENT / VERIFICATION / POST-DEPLOYMENT
 # ----------------------------------------------------------------------
 
+def toolchain_fingerprint():
+    """
+    Cheap stat-only fingerprint of the toolchain: forge binary and lib/.
+    """
+    forge = shutil.which("forge")
+    parts = [forge or "", str(os.path.getmtime(forge)) if forge else ""]
+    parts.append(str(os.path.getmtime("lib")) if os.path.exists("lib") else "")
+    return "|".join(parts)
+
 def install_foundry_dependencies():
+    """
+    Make sure forge and the contract libraries are available. A successful
+    check is cached in TOOLCHAIN_CACHE_FILE and reused until the forge binary
+    or lib/ changes, so repeated launches skip the forge subprocess.
+    """
+    started = time.perf_counter()
+    try:
+        _check_toolchain()
+    finally:
+        startup_phase("toolchain check", started)
+
+def _check_toolchain():
+    fingerprint = toolchain_fingerprint()
+    if os.path.exists(TOOLCHAIN_CACHE_FILE):
+        try:
+            with open(TOOLCHAIN_CACHE_FILE, "r") as f:
+                cached = json.load(f)
+            if cached.get("fingerprint") == fingerprint:
+                print(f"[✓] Foundry Dependencies Already Installed ({cached.get('forge_version', 'forge')})")
+                return
+        except ValueError:
+            pass
+
+    if not shutil.which("forge"):
+        print("[!] forge not found. Install foundry first (see README).")
+        exit(1)
     if not os.path.exists("lib"):
         print("[+] Installing Foundry Dependencies...")
         subprocess.run(["forge", "install", "--no-commit"], check=True)
         print("[✓] Foundry Dependencies Installed")
     else:
         print("[✓] Foundry Dependencies Already Installed")
+    version = subprocess.run(["forge", "--version"], capture_output=True, text=True).stdout.strip().splitlines()
+    with open(TOOLCHAIN_CACHE_FILE, "w") as f:
+        json.dump({"fingerprint": toolchain_fingerprint(), "forge_version": version[0] if version else ""}, f)
 
 def generate_contract(name, symbol):
+    if PARAMETRIZED_BUILD:
+        print(f"[+] Using shared {PARAM_CONTRACT_NAME} template for {name} ({symbol})...")
+        with span("generate_contract"):
+            write_if_changed(f"contracts/{PARAM_CONTRACT_NAME}.sol", PARAM_CONTRACT_TEMPLATE)
+        print(f"[✓] Contract {PARAM_CONTRACT_NAME}.sol Ready")
+        return
     print(f"[+] Generating {name} Smart Contract...")
-    code = CONTRACT_TEMPLATE.format(name=name, symbol=symbol)
-    os.makedirs("contracts", exist_ok=True)
-    with open(f"contracts/{name}.sol", "w") as file:
-        file.write(code)
+    with span("generate_contract"):
+        code = CONTRACT_TEMPLATE.format(name=name, symbol=symbol)
+        write_if_changed(f"contracts/{name}.sol", code)
     print(f"[✓] Contract {name}.sol Generated")
 
+def write_if_changed(path, content):
+    """
+    Write content to path unless the file already holds exactly that content,
+    so unchanged sources keep the same build hash.
+    """
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            if f.read() == content:
+                return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+def contract_target(name):
+    """
+    Return (forge target, parametrized) for a token name. Tokens without their
+    own contracts/<name>.sol were deployed from the shared template.
+    """
+    if os.path.exists(f"contracts/{name}.sol"):
+        return f"contracts/{name}.sol:{name}", False
+    return f"contracts/{PARAM_CONTRACT_NAME}.sol:{PARAM_CONTRACT_NAME}", True
+
+def build_hash():
+    """
+    Hash of every contract source, the compiler settings in foundry.toml, the
+    toolchain fingerprint and the library sources under lib/. Libraries are
+    only stat'ed: a checkout or update rewrites the files it touches.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob("contracts/**/*.sol", recursive=True)) + ["foundry.toml"]:
+        if not os.path.exists(path):
+            continue
+        digest.update(path.encode())
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    digest.update(toolchain_fingerprint().encode())
+    for path in sorted(glob.glob("lib/**/*.sol", recursive=True)):
+        stat = os.stat(path)
+        digest.update(f"{path}|{stat.st_mtime_ns}|{stat.st_size}".encode())
+    return digest.hexdigest()
+
 def compile_contract():
+    """
+    Run forge build unless out/ already holds artifacts for the current
+    sources and settings.
+    """
     print("[+] Compiling Contract...")
-    if os.path.exists("out"):
-        print("[+] Removing previous build files...")
-        subprocess.run(["rm", "-rf", "out"])
+    with span("compile_contract") as phase:
+        current = build_hash()
+        if os.path.exists(BUILD_HASH_FILE):
+            with open(BUILD_HASH_FILE, "r") as f:
+                if f.read().strip() == current:
+                    phase.outcome = "cached"
+                    print("[✓] Build cache hit, skipping compilation")
+                    return
         subprocess.run(["forge", "build"], check=True)
+        with open(BUILD_HASH_FILE, "w") as f:
+            f.write(current)
     print("[✓] Compilation Done")
 
-def deploy_contract(rpc_url, private_key, name):
+def load_artifact(name):
+    """
+    Return (abi, bytecode) for the contract that a token named `name` is
+    deployed from. Artifacts are read from out/ once and kept in memory
+    until forge rewrites the file.
+    """
+    contract = PARAM_CONTRACT_NAME if PARAMETRIZED_BUILD else name
+    path = f"out/{contract}.sol/{contract}.json"
+    mtime = os.path.getmtime(path)
+    cached = _ARTIFACT_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+    with open(path, "r") as f:
+        artifact = json.load(f)
+    abi = artifact["abi"]
+    bytecode = artifact["bytecode"]["object"]
+    if not bytecode or bytecode == "0x":
+        raise ValueError(f"{path} has no bytecode")
+    _ARTIFACT_CACHE[path] = (mtime, abi, bytecode)
+    return abi, bytecode
+
+def constructor_args(name, symbol, deployer):
+    return (name, symbol or name, deployer) if PARAMETRIZED_BUILD else (deployer,)
+
+def create2_plan(name, symbol, deployer):
+    """
+    Return (salt, init code, address) of a CREATE2 deployment of a token from
+    the current build. Needs the compiled artifact but no RPC.
+    """
+    from create2 import token_salt, init_code, create2_address
+    from codec import canonical_type
+    from eth_utils import to_checksum_address
+    deployer = to_checksum_address(deployer)
+    abi, bytecode = load_artifact(name)
+    constructor = next((item for item in abi if item.get("type") == "constructor"), {"inputs": []})
+    code = init_code(bytecode, [canonical_type(p) for p in constructor["inputs"]],
+                     constructor_args(name, symbol, deployer))
+    salt = token_salt(name, symbol or name, deployer)
+    return salt, code, create2_address(salt, code)
+
+def deploy_contract_create2(rpc_url, private_key, name, symbol=None, chain_id=None):
+    """
+    Deploy a token through the deterministic deployment proxy. A token that
+    already has code at its predicted address is not sent again; its address
+    is returned as if it had just been deployed.
+    """
+    from create2 import DETERMINISTIC_DEPLOYER, deploy_calldata, deployed
+    w3, acct = init_web3(rpc_url, private_key)
+    try:
+        salt, code, contract_address = create2_plan(name, symbol, acct.address)
+        # The proxy and the target in one batch before spending anything.
+        has_code = deployed(rpc_url, [DETERMINISTIC_DEPLOYER, contract_address])
+    except Exception as e:
+        print(f"[!] CREATE2 deployment unavailable: {e}")
+        return None
+    if has_code[contract_address]:
+        print(f"[✓] {name} already deployed at {contract_address}, skipping")
+        return contract_address
+    if not has_code[DETERMINISTIC_DEPLOYER]:
+        print(f"[!] No deterministic deployment proxy at {DETERMINISTIC_DEPLOYER} on this chain")
+        return None
+
+    try:
+        tx = {"to": DETERMINISTIC_DEPLOYER, "data": deploy_calldata(salt, code)}
+        tx_hash = sign_and_send(w3, acct, chain_id or w3.eth.chain_id, tx, private_key, kind="deploy")
+        print(f"[+] Deployment Transaction Hash: {tx_hash}")
+        tracked = get_tracker().wait(tx_hash, timeout=RECEIPT_TIMEOUT, until="mined")
+    except Exception as e:
+        print(f"[!] Deployment Failed: {e}")
+        return None
+    if tracked.status in ("dropped", "reverted") or int(tracked.receipt["status"], 16) != 1:
+        print(f"[!] Deployment Failed (transaction {tracked.status})")
+        return None
+    DEPLOY_BLOCKS[contract_address.lower()] = tracked.block_number
+    print(f"[✓] Contract Deployed at: {contract_address}")
+    return contract_address
+
+@traced("deploy_contract")
+def deploy_contract(rpc_url, private_key, name, force=False, symbol=None, chain_id=None):
+    """
+    Deploy a token and return its address, or None on failure.
+    The creation transaction is built from the cached build artifacts and
+    signed in-process; forge create is used when DEPLOY_WITH_FORGE is set,
+    when force is requested, or when the transaction cannot be prepared.
+    DEPLOY_CREATE2 deploys through the deterministic deployment proxy instead.
+    """
     print("[+] Deploying Contract...")
+    if DEPLOY_CREATE2:
+        return deploy_contract_create2(rpc_url, private_key, name, symbol, chain_id)
+    if DEPLOY_WITH_FORGE or force:
+        return deploy_contract_forge(rpc_url, private_key, name, force, symbol)
+
+    w3, acct = init_web3(rpc_url, private_key)
+    try:
+        abi, bytecode = load_artifact(name)
+        args = constructor_args(name, symbol, acct.address)
+        chain_id = chain_id or w3.eth.chain_id
+        tx = w3.eth.contract(abi=abi, bytecode=bytecode).constructor(*args).build_transaction({
+            "from": acct.address,
+            "chainId": chain_id,
+            **GAS.fees(w3, chain_id, GAS_PROFILE),
+        })
+    except Exception as e:
+        print(f"[!] Native deployment unavailable ({e}), falling back to forge create")
+        return deploy_contract_forge(rpc_url, private_key, name, force, symbol)
+
+    try:
+        tx_hash = sign_and_send(w3, acct, chain_id, tx, private_key, kind="deploy")
+        print(f"[+] Deployment Transaction Hash: {tx_hash}")
+        tracked = get_tracker().wait(tx_hash, timeout=RECEIPT_TIMEOUT, until="mined")
+    except Exception as e:
+        print(f"[!] Deployment Failed: {e}")
+        return None
+    if tracked.status in ("dropped", "reverted") or not tracked.contract_address \
+            or int(tracked.receipt["status"], 16) != 1:
+        print(f"[!] Deployment Failed (transaction {tracked.status})")
+        return None
+    contract_address = w3.to_checksum_address(tracked.contract_address)
+    DEPLOY_BLOCKS[contract_address.lower()] = tracked.block_number
+    print(f"[✓] Contract Deployed at: {contract_address}")
+    return contract_address
+
+def deploy_contract_forge(rpc_url, private_key, name, force=False, symbol=None):
+    """
+    Deploy a token with forge create. The deployer is passed as the initial
+    owner, parametrized builds pass name and symbol as well. force=True makes
+    forge rebuild everything first; leave it off when several deployments
+    share the same build.
+    """
+    if PARAMETRIZED_BUILD:
+        target = f"contracts/{PARAM_CONTRACT_NAME}.sol:{PARAM_CONTRACT_NAME}"
+    else:
+        target = f"contracts/{name}.sol:{name}"
     deploy_cmd = [
         "forge", "create",
-        "--rpc-url", rpc_url,
+        "--rpc-url", forge_rpc_url(rpc_url),
         "--private-key", private_key,
         "--broadcast",
-        "--force",
-        f"contracts/{name}.sol:{name}"
     ]
+    if force:
+        deploy_cmd.append("--force")
+    deploy_cmd.append(target)
+    deploy_cmd += ["--constructor-args", *constructor_args(name, symbol, get_account(private_key).address)]
     result = subprocess.run(deploy_cmd, capture_output=True, text=True)
-    print("Deployment Output:")                                                                                                                             
+    print("Deployment Output:")
     print(result.stdout)
     if "Deployed to:" in result.stdout:
         contract_address = result.stdout.split("Deployed to: ")[1].split("\n")[0].strip()
@@ -220,83 +593,85 @@ def deploy_contract(rpc_url, private_key, name):
 # 5) STORING & UPDATING TOKEN INFO (with deployer field)
 # ----------------------------------------------------------------------
 
-def store_contract_info(chain_name, token_name, contract_address, deployer, verified_status="unverified"):
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+
+def get_registry():
+    """
+    Open the deployment registry on first use. Rows from an existing
+    contract_info.txt are imported into it once.
+    """
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = Registry(REGISTRY_FILE)
+            imported = _REGISTRY.import_flat_file(CONTRACT_INFO_FILE)
+            if imported:
+                print(f"[✓] Imported {imported} deployments from {CONTRACT_INFO_FILE} into {REGISTRY_FILE}")
+        return _REGISTRY
+
+def store_contract_info(chain_name, token_name, contract_address, deployer, verified_status="unverified", block_number=None):
     """
-    Append new token info to contract_info.txt in the format:
-    chainName,tokenName,contractAddress,verificationStatus,deployerAddress
+    Record a new deployment in the registry.
     """
-    with open(CONTRACT_INFO_FILE, "a") as f:
-        f.write(f"{chain_name},{token_name},{contract_address},{verified_status},{deployer}\n")
+    block_number = block_number or DEPLOY_BLOCKS.get(contract_address.lower())
+    get_registry().add_deployment(chain_name, token_name, contract_address, deployer, verified_status, block_number)
 
 def list_contract_info(chain_name, deployer):
     """
     Return a list of (token_name, contract_address, verification_status)
     for tokens on the given chain_name deployed by the given deployer.
     """
-    tokens = []
-    if os.path.exists(CONTRACT_INFO_FILE):
-        with open(CONTRACT_INFO_FILE, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    parts = line.split(",")
-                    if len(parts) == 5:
-                        stored_chain, token_name, contract_address, status, token_deployer = parts
-                        if stored_chain == chain_name and token_deployer.lower() == deployer.lower():
-                            tokens.append((token_name, contract_address, status))
-    return tokens
+    return get_registry().list_deployments(chain_name, deployer)
 
 def update_verification_status(chain_name, token_name, contract_address, deployer, new_status):
-    if not os.path.exists(CONTRACT_INFO_FILE):
-        return
-    lines = []
-    with open(CONTRACT_INFO_FILE, "r") as f:
-        for line in f:
-            line_stripped = line.strip()
-            if not line_stripped:
-                continue
-            parts = line_stripped.split(",")
-            if len(parts) == 5:
-                c, t, addr, s, d = parts
-                if c == chain_name and t == token_name and addr.lower() == contract_address.lower() and d.lower() == deployer.lower():
-                    lines.append(f"{c},{t},{addr},{new_status},{d}")
-                else:
-                    lines.append(line_stripped)
-            else:
-                lines.append(line_stripped)
-    with open(CONTRACT_INFO_FILE, "w") as f:
-        for l in lines:
-            f.write(l + "\n")
+    get_registry().set_status(chain_name, token_name, contract_address, deployer, new_status)
 
 # ----------------------------------------------------------------------
 # 6) VERIFICATION & POST-DEPLOYMENT ACTIONS
 # ----------------------------------------------------------------------
 
-def verify_contract(rpc_url, chain_config, token_name, contract_address, deployer):
+def forge_rpc_url(rpc_url):
+    """
+    forge takes a single --rpc-url; use the currently best scored endpoint
+    when the chain lists several.
+    """
+    if "," not in rpc_url:
+        return rpc_url
+    from rpc import get_pool
+    return get_pool(rpc_url).best_url()
+
+def verify_contract(rpc_url, chain_config, token_name, contract_address, deployer, confirm=True):
     """
     Verify the contract.
     If the chain is 'monad', use the custom Sourcify endpoint and source location 'src/<token_name>.sol'.
     Otherwise, use Etherscan verification.
+    confirm=False skips the yes/no prompt. Returns True once verified.
     """
     chain_name = chain_config["name"]
     chain_id = str(chain_config["CHAIN_ID"])
-    choice = get_input("Do you want to verify the contract? (yes/no or 'b' to go back): ")
-    if choice is None:
-        print("[!] Skipping verification. Going back.")
-        return
-    if choice.lower() != "yes":
-        print("[!] Verification Skipped")
-        return
+    if confirm:
+        choice = get_input("Do you want to verify the contract? (yes/no/queue or 'b' to go back): ")
+        if choice is None:
+            print("[!] Skipping verification. Going back.")
+            return False
+        if choice.lower() == "queue":
+            queue_verification(chain_config, token_name, contract_address, deployer)
+            return False
+        if choice.lower() != "yes":
+            print("[!] Verification Skipped")
+            return False
 
     print("[+] Verifying Contract...")
+    target, _ = contract_target(token_name)
 
-    if "monad" in chain_name.lower():
+    if verifier_for(chain_config) == "sourcify":
         # For Monad, use the updated command: note the source file path is in "contracts/"
         verify_cmd = [
             "forge", "verify-contract",
             contract_address,
-            f"contracts/{token_name}.sol:{token_name}",
-            "--rpc-url", rpc_url,
+            target,
+            "--rpc-url", forge_rpc_url(rpc_url),
             "--chain-id", chain_id,
             "--verifier", "sourcify",
             "--verifier-url", "https://sourcify-api-monad.blockvision.org"
@@ -308,8 +683,8 @@ def verify_contract(rpc_url, chain_config, token_name, contract_address, deploye
         verify_cmd = [
             "forge", "verify-contract",
             contract_address,
-            f"contracts/{token_name}.sol:{token_name}",
-            "--rpc-url", rpc_url,
+            target,
+            "--rpc-url", forge_rpc_url(rpc_url),
             "--verifier", verifier,
             "--etherscan-api-key", etherscan_api_key,
             "--chain-id", chain_id,
@@ -317,7 +692,13 @@ def verify_contract(rpc_url, chain_config, token_name, contract_address, deploye
         if etherscan_api_url:
             verify_cmd += ["--etherscan-api-url", etherscan_api_url]
 
-    result = subprocess.run(verify_cmd, capture_output=True, text=True)
+    # Every template takes the initial owner; parametrized ones name and symbol too.
+    verify_cmd.append("--guess-constructor-args")
+
+    with span("verify_contract", verifier=verifier_for(chain_config)) as phase:
+        result = subprocess.run(verify_cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            phase.outcome = "failed"
     print("Verification Output:")
     print(result.stdout)
     if result.stderr:
@@ -327,110 +708,445 @@ def verify_contract(rpc_url, chain_config, token_name, contract_address, deploye
     if result.returncode == 0:
         print(f"[✓] Contract Verified on {chain_name}")
         update_verification_status(chain_name, token_name, contract_address, deployer, "verified")
+        return True
     else:
         print("[!] Verification failed. Check the error messages above.")
+        return False
+
+def verifier_for(chain_config):
+    return "sourcify" if "monad" in chain_config["name"].lower() else "etherscan"
+
+_VERIFY_QUEUE = None
+_VERIFY_QUEUE_LOCK = threading.Lock()
+
+def get_verify_queue():
+    """
+    Create the background verification queue and start its workers on first
+    use. Its jobs live in the registry, so anything still queued when the
+    program exits is picked up again by the next run that opens the queue or
+    by the verify-worker command.
+    """
+    global _VERIFY_QUEUE
+    with _VERIFY_QUEUE_LOCK:
+        if _VERIFY_QUEUE is None:
+            _VERIFY_QUEUE = VerifyQueue(get_registry(), _verify_queued_job)
+            _VERIFY_QUEUE.start()
+        return _VERIFY_QUEUE
+
+def _verify_queued_job(job):
+    chain_config = load_chains().get(job["chain"])
+    if chain_config is None:
+        raise ValueError(f"chain '{job['chain']}' not found in chains.txt")
+    with labels(chain=job["chain"]):
+        return verify_contract(chain_config["RPC_URL"], chain_config, job["token_name"], job["address"],
+                               job["deployer"], confirm=False)
+
+def queue_verification(chain_config, token_name, contract_address, deployer, delay=VERIFY_DELAY):
+    """
+    Hand a contract to the background verification workers. The first attempt
+    waits `delay` seconds so the explorer has time to index the deployment.
+    """
+    get_verify_queue().enqueue(chain_config["name"], token_name, contract_address, deployer,
+                               verifier_for(chain_config), delay)
+    print(f"[+] Verification of {token_name} queued")
+
+_WEB3_CACHE = {}
+
+def get_account(private_key):
+    return ACCOUNTS.get(private_key)
 
 def init_web3(rpc_url, private_key):
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
-    acct = Account.from_key(private_key)
+    """
+    Return (w3, account). One Web3 instance is kept per RPC URL and all of
+    them share the pooled keep-alive transport from rpc.py.
+    """
+    w3 = _WEB3_CACHE.get(rpc_url)
+    if w3 is None:
+        started = time.perf_counter()
+        from web3 import Web3
+        from rpc import PooledHTTPProvider
+        if len(_WEB3_CACHE) == 0:
+            startup_phase("web3 import", started)
+        w3 = _WEB3_CACHE.setdefault(rpc_url, Web3(PooledHTTPProvider(rpc_url)))
+    acct = get_account(private_key)
     return w3, acct
 
+_TRACKER = None
+_TRACKER_LOCK = threading.Lock()
+
+def get_tracker():
+    """
+    Start the background receipt tracker on first use.
+    """
+    global _TRACKER
+    with _TRACKER_LOCK:
+        if _TRACKER is None:
+            from tracker import ReceiptTracker
+            _TRACKER = ReceiptTracker(confirmations=CONFIRMATIONS, on_final=record_final_transaction)
+            if BUMP_AFTER:
+                get_fee_bumper(_TRACKER, BUMP_AFTER).start()
+        return _TRACKER
+
+_FEE_BUMPER = None
+
+def get_fee_bumper(tracker, stuck_after):
+    """
+    Fee bumping watchdog over the receipt tracker, for the keys in keys.txt.
+    Replacements pay at least the chain's 'urgent' fees.
+    """
+    global _FEE_BUMPER
+    if _FEE_BUMPER is None:
+        from fee_bumper import FeeBumper
+        _FEE_BUMPER = FeeBumper(tracker, signer_for, stuck_after, int(FEE_CEILING_GWEI * 10**9) or None,
+                                market=urgent_fees, on_replace=record_replacement)
+    return _FEE_BUMPER
+
+def signer_for(address):
+    for private_key in load_keys().values():
+        if get_account(private_key).address.lower() == address.lower():
+            return private_key
+    return None
+
+def urgent_fees(tracked):
+    w3 = _WEB3_CACHE.get(tracked.rpc_url)
+    if w3 is None or "chain_id" not in tracked.meta:
+        return None
+    return GAS.fees(w3, tracked.meta["chain_id"], "urgent")
+
+def record_replacement(tracked, new_hash, fees):
+    get_registry().add_transaction(new_hash, tracked.meta.get("chain_id"), tracked.meta.get("from"),
+                                   tracked.meta.get("kind"))
+    if "nonce" in tracked.meta:
+        # The node drops the replaced version; the lane must not take that for a gap.
+        NONCES.confirm(tracked.meta["chain_id"], tracked.meta["from"], tracked.meta["nonce"], new_hash)
+
+def record_final_transaction(tracked):
+    # Every version of a replaced transaction has a row; only the mined one keeps the receipt.
+    for tx_hash in tracked.hashes:
+        if tracked.landed in (None, tx_hash):
+            get_registry().finish_transaction(tx_hash, tracked.status, tracked.block_number,
+                                              tracked.gas_used, tracked.confirmations)
+        else:
+            get_registry().finish_transaction(tx_hash, "replaced")
+    if tracked.replaced:
+        print(f"[✓] {tracked.hash} landed as replacement {tracked.hashes.index(tracked.landed)} "
+              f"of {len(tracked.hashes) - 1}: {tracked.landed} ({tracked.status})")
+    if tracked.status == "dropped":
+        print(f"[!] Transaction dropped: {tracked.hash}")
+        w3 = _WEB3_CACHE.get(tracked.rpc_url)
+        if w3 is not None and "from" in tracked.meta:
+            # Every later nonce waits on the dropped one, so fill it right away.
+            private_key = signer_for(tracked.meta["from"])
+            if private_key is None:
+                NONCES.resync(w3, tracked.meta["chain_id"], tracked.meta["from"])
+            else:
+                fill_nonce_gaps(w3, get_account(private_key), tracked.meta["chain_id"], private_key)
+
+def sign_and_send(w3, acct, chain_id, tx, private_key, kind=None, group=None):
+    """
+    Fill in gas, fees (GAS_PROFILE) and the nonce from the shared nonce
+    manager, sign and broadcast tx. Returns the transaction hash as a hex
+    string. A rejected transaction gives its nonce back; a "nonce too low"
+    rejection resyncs the lane and retries once.
+    Sent transactions are handed to the receipt tracker (optionally as part
+    of `group`) and recorded in the registry.
+    """
+    try:
+        tx = GAS.prepare(w3, chain_id, tx, acct.address, GAS_PROFILE)
+    except Exception as e:
+        # Gas estimation runs the call; name the custom error it reverted with.
+        reason = token_codec().decode_revert(getattr(e, "data", None)) if isinstance(getattr(e, "data", None), str) else None
+        if reason:
+            raise ValueError(f"transaction would revert: {reason}") from e
+        raise
+    for attempt in range(2):
+        nonce = NONCES.allocate(w3, chain_id, acct.address)
+        with span("sign", kind=kind):
+            signed_tx = w3.eth.account.sign_transaction(dict(tx, nonce=nonce, chainId=chain_id), private_key)
+        try:
+            with span("send", kind=kind):
+                tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        except ValueError as e:
+            message = str(e).lower()
+            if "already known" in message:
+                tx_hash = signed_tx.hash
+            elif "nonce too low" in message and attempt == 0:
+                NONCES.confirm(chain_id, acct.address, nonce)
+                NONCES.resync(w3, chain_id, acct.address)
+                continue
+            else:
+                NONCES.release(chain_id, acct.address, nonce)
+                raise
+        except Exception:
+            # The node may or may not have received it; ask instead of guessing.
+            NONCES.confirm(chain_id, acct.address, nonce, w3.to_hex(signed_tx.hash))
+            NONCES.resync(w3, chain_id, acct.address)
+            raise
+        tx_hash = w3.to_hex(tx_hash)
+        NONCES.confirm(chain_id, acct.address, nonce, tx_hash)
+        get_registry().add_transaction(tx_hash, chain_id, acct.address, kind)
+        get_tracker().track(w3.provider.endpoint_uri, tx_hash, group,
+                            {"chain_id": chain_id, "from": acct.address, "kind": kind, "nonce": nonce})
+        return tx_hash
+
+def fill_nonce_gaps(w3, acct, chain_id, private_key):
+    """
+    Resync the nonce lane and send a zero-value self transfer for every gap
+    left by dropped transactions, so later nonces are no longer blocked.
+    """
+    gaps = NONCES.resync(w3, chain_id, acct.address)
+    for _ in gaps:
+        if not NONCES.gaps(chain_id, acct.address):
+            break  # other sends on the lane took the remaining gaps
+        tx = {
+            "to": acct.address,
+            "value": 0,
+            "gas": 21000,
+        }
+        print(f"[+] Filling nonce gap: {sign_and_send(w3, acct, chain_id, tx, private_key, kind='gap-fill')}")
+    return gaps
+
+def normalize_address(w3, addr):
+    """
+    Return the checksum form of addr, or None if it is not a valid address.
+    """
+    if w3.is_address(addr):
+        return w3.to_checksum_address(addr)
+    return None
+
 def prompt_valid_address(w3, prompt_msg):
     while True:
         addr = get_input(prompt_msg)
         if addr is None:
             return None
-        if w3.is_address(addr):
-            return w3.to_checksum_address(addr)
+        checksum_addr = normalize_address(w3, addr)
+        if checksum_addr:
+            return checksum_addr
         else:
             print("Invalid address. Please enter a valid Ethereum address or 'b' to go back.")
 
-def mint_tokens(w3, acct, chain_id, contract_address, private_key):
-    recipient = prompt_valid_address(w3, "Enter recipient address (or 'b' to go back): ")
+_TOKEN_CODEC = None
+_DECIMALS = {}
+
+def token_codec():
+    """
+    Selectors and decoders of the token template, built once from a compiled
+    token artifact in out/ when there is one, else from codec.TOKEN_ABI.
+    """
+    global _TOKEN_CODEC
+    if _TOKEN_CODEC is None:
+        from codec import Codec, TOKEN_ABI
+        abi = TOKEN_ABI
+        sources = [PARAM_CONTRACT_NAME] + [os.path.basename(p)[:-4] for p in glob.glob("contracts/*.sol")]
+        for name in sources:
+            path = f"out/{name}.sol/{name}.json"
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    abi = json.load(f)["abi"]
+                break
+        _TOKEN_CODEC = Codec(abi)
+    return _TOKEN_CODEC
+
+def token_decimals(w3, contract_address):
+    """
+    decimals() of a token, read once per RPC and contract.
+    """
+    key = (w3.provider.endpoint_uri, contract_address.lower())
+    if key not in _DECIMALS:
+        codec = token_codec()
+        _DECIMALS[key] = codec.decode("decimals", w3.eth.call({"to": contract_address, "data": codec.encode("decimals")}))
+    return _DECIMALS[key]
+
+def build_mint_tx(w3, contract_address, recipient, amount):
+    # mint() and burn() multiply by 10 ** decimals() on-chain, so they take whole tokens.
+    return {
+        "to": contract_address,
+        "data": token_codec().encode("mint", recipient, int(amount)),
+    }
+
+def mint_tokens(w3, acct, chain_id, contract_address, private_key, recipient=None, amount=None):
     if recipient is None:
-        return
-    amount = get_input("Enter amount to mint (or 'b' to go back): ")
+        recipient = prompt_valid_address(w3, "Enter recipient address (or 'b' to go back): ")
+        if recipient is None:
+            return
     if amount is None:
-        return
+        amount = get_input("Enter amount to mint (or 'b' to go back): ")
+        if amount is None:
+            return
     print(f"[+] Minting {amount} tokens to {recipient}...")
-    mint_selector = w3.keccak(text="mint(address,uint256)")[:4]
-    encoded_recipient = bytes.fromhex(recipient[2:]).rjust(32, b'\0')
-    encoded_amount = int(amount).to_bytes(32, 'big')
-    data = mint_selector + encoded_recipient + encoded_amount
-    tx = {
-        "to": contract_address,                                                                                                                                                          
-        "data": data,
-        "gas": 100000,
-        "maxFeePerGas": w3.to_wei("57", "gwei"),
-        "maxPriorityFeePerGas": w3.to_wei("50", "gwei"),
-        "chainId": chain_id,
-        "nonce": w3.eth.get_transaction_count(acct.address),
-    }
-    signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-    print(f"[✓] Mint Transaction Hash: {w3.to_hex(tx_hash)}")
+    tx = build_mint_tx(w3, contract_address, recipient, amount)
+    tx_hash = sign_and_send(w3, acct, chain_id, tx, private_key, kind="mint")
+    print(f"[✓] Mint Transaction Hash: {tx_hash}")
+    return tx_hash
 
-def burn_tokens(w3, acct, chain_id, contract_address, private_key):
-    amount = get_input("Enter amount to burn (or 'b' to go back): ")
+def burn_tokens(w3, acct, chain_id, contract_address, private_key, amount=None):
     if amount is None:
-        return
+        amount = get_input("Enter amount to burn (or 'b' to go back): ")
+        if amount is None:
+            return
     print(f"[+] Burning {amount} tokens...")
-    burn_selector = w3.keccak(text="burn(uint256)")[:4]
-    encoded_amount = int(amount).to_bytes(32, 'big')                                                                                                                                 
-    data = burn_selector + encoded_amount
     tx = {
         "to": contract_address,
-        "data": data,
-        "gas": 100000,
-        "maxFeePerGas": w3.to_wei("57", "gwei"),
-        "maxPriorityFeePerGas": w3.to_wei("50", "gwei"),
-        "chainId": chain_id,
-        "nonce": w3.eth.get_transaction_count(acct.address),
-        }
-    signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-    print(f"[✓] Burn Transaction Hash: {w3.to_hex(tx_hash)}")
+        "data": token_codec().encode("burn", int(amount)),
+    }
+    tx_hash = sign_and_send(w3, acct, chain_id, tx, private_key, kind="burn")
+    print(f"[✓] Burn Transaction Hash: {tx_hash}")
+    return tx_hash
 
 def renounce_ownership(w3, acct, chain_id, contract_address, private_key):
     print("[+] Renouncing Ownership...")
-    renounce_selector = w3.keccak(text="renounce()")[:4]
     tx = {
         "to": contract_address,
-        "data": renounce_selector,
-        "gas": 100000,
-        "maxFeePerGas": w3.to_wei("57", "gwei"),
-        "maxPriorityFeePerGas": w3.to_wei("50", "gwei"),
-        "chainId": chain_id,
-        "nonce": w3.eth.get_transaction_count(acct.address),
+        "data": token_codec().encode("renounce"),
     }
-    signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-    print(f"[✓] Renounce Ownership Transaction Hash: {w3.to_hex(tx_hash)}")
+    tx_hash = sign_and_send(w3, acct, chain_id, tx, private_key, kind="renounce")
+    print(f"[✓] Renounce Ownership Transaction Hash: {tx_hash}")
+    return tx_hash
 
-def transfer_tokens(w3, acct, chain_id, contract_address, private_key):
-    recipient = prompt_valid_address(w3, "Enter the recipient address (or 'b' to go back): ")
+def build_transfer_tx(w3, contract_address, recipient, amount):
+    # transfer() is plain ERC20 and takes base units; scale whole tokens here.
+    from codec import to_base_units
+    amount = to_base_units(amount, token_decimals(w3, contract_address))
+    return {
+        "to": contract_address,
+        "data": token_codec().encode("transfer", recipient, amount),
+    }
+
+def transfer_tokens(w3, acct, chain_id, contract_address, private_key, recipient=None, amount=None):
     if recipient is None:
-        return
-    amount = get_input("Enter the amount to transfer (or 'b' to go back): ")
+        recipient = prompt_valid_address(w3, "Enter the recipient address (or 'b' to go back): ")
+        if recipient is None:
+            return
     if amount is None:
-        return
+        amount = get_input("Enter the amount to transfer (or 'b' to go back): ")
+        if amount is None:
+            return
     print(f"[+] Transferring {amount} tokens to {recipient}...")
-    transfer_selector = w3.keccak(text="transfer(address,uint256)")[:4]
-    encoded_recipient = bytes.fromhex(recipient[2:]).rjust(32, b'\0')
-    encoded_amount = int(amount).to_bytes(32, 'big')
-    data = transfer_selector + encoded_recipient + encoded_amount
-    tx = {
-        "to": contract_address,
-        "data": data,
-        "gas": 100000,
-        "maxFeePerGas": w3.to_wei("57", "gwei"),
-        "maxPriorityFeePerGas": w3.to_wei("50", "gwei"),
-        "chainId": chain_id,
-        "nonce": w3.eth.get_transaction_count(acct.address),
-    }
-    signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-    print(f"[✓] Transfer Transaction Hash: {w3.to_hex(tx_hash)}")
+    tx = build_transfer_tx(w3, contract_address, recipient, amount)
+    tx_hash = sign_and_send(w3, acct, chain_id, tx, private_key, kind="transfer")
+    print(f"[✓] Transfer Transaction Hash: {tx_hash}")
+    return tx_hash
+
+BULK_BUILDERS = {"mint": build_mint_tx, "transfer": build_transfer_tx}
+
+def bulk_send(w3, acct, chain_id, contract_address, private_key, path, action="mint", window=16, checkpoint_path=None):
+    """
+    Mint or transfer to every (address, amount) row of a CSV / JSONL file.
+    Rows are validated like prompt_valid_address, at most `window`
+    transactions are unconfirmed at once, and progress is checkpointed to
+    <path>.checkpoint so an interrupted run resumes where it stopped.
+    """
+    build_tx = BULK_BUILDERS[action]
+
+    tracker = get_tracker()
+
+    def send(recipient, amount):
+        tx = build_tx(w3, contract_address, recipient, amount)
+        return sign_and_send(w3, acct, chain_id, tx, private_key, kind=action)
+
+    def wait(tx_hash):
+        # Receipts are polled in batches by the tracker; this only blocks
+        # until the oldest transaction of the window is mined.
+        try:
+            tracked = tracker.wait(tx_hash, timeout=RECEIPT_TIMEOUT, until="mined")
+            if tracked.status in ("reverted", "dropped") or int(tracked.receipt["status"], 16) != 1:
+                print(f"[!] Transaction {tracked.status}: {tx_hash}")
+        except Exception as e:
+            print(f"[!] No receipt for {tx_hash}: {e}")
+
+    print(f"[+] Bulk {action} from {path} (window {window})...")
+    stats = run_bulk(path, lambda addr: normalize_address(w3, addr), send, wait, checkpoint_path, window)
+    print(f"[✓] Bulk {action} done: {stats['sent']} sent, {stats['skipped']} already done, "
+          f"{stats['invalid']} invalid, {stats['failed']} failed")
+    return stats
+
+# Gas limit of every pre-signed transaction; nothing can be estimated offline.
+SPOOL_GAS = 150000
+
+def presign_bulk(chain_config, private_key, contract_address, path, action="mint", spool_path=None,
+                 nonce=None, fees=None, gas=None, workers=None, decimals=None):
+    """
+    Sign one mint / transfer per recipients-file row into a spool file for a
+    later broadcast. Only a missing nonce, missing fees or (for transfers)
+    missing token decimals are read from the RPC, so with those given this
+    runs without network access.
+    """
+    from spool import sign_spool
+    from codec import iter_rows, to_base_units
+    chain_id = int(chain_config["CHAIN_ID"])
+    w3, acct = init_web3(chain_config["RPC_URL"], private_key)
+    contract_address = w3.to_checksum_address(contract_address)
+    if nonce is None:
+        nonce = w3.eth.get_transaction_count(acct.address, "pending")
+    if fees is None:
+        fees = GAS.fees(w3, chain_id, GAS_PROFILE)
+    if action == "transfer" and decimals is None:
+        decimals = token_decimals(w3, contract_address)
+    scale = (lambda amount: to_base_units(amount, decimals)) if action == "transfer" else int
+
+    def encode(recipients, amounts):
+        return iter_rows(*token_codec().encode_rows(action, recipients, [scale(a) for a in amounts]))
+
+    spool_path = spool_path or path + ".spool"
+    print(f"[+] Signing {action} transactions from {path} into {spool_path} (first nonce {nonce})...")
+    stats = sign_spool(path, spool_path, private_key, acct.address, chain_id, contract_address, encode,
+                       lambda addr: normalize_address(w3, addr), nonce, fees, gas or SPOOL_GAS, workers)
+    print(f"[✓] {stats['signed']} signed, {stats['skipped']} already in the spool, {stats['invalid']} invalid")
+    return stats
+
+def broadcast_spool_file(chain_config, spool_path, rate=None, batch_size=20, wait=True):
+    """
+    Broadcast a spool made by presign_bulk. Accepted transactions are recorded
+    in the registry and followed by the receipt tracker like any other.
+    """
+    from spool import broadcast_spool, read_spool
+    check_chain_id(chain_config)
+    rpc_url = chain_config["RPC_URL"]
+    chain_id = int(chain_config["CHAIN_ID"])
+    header, _ = read_spool(spool_path)
+    if header is None or header.get("chain_id") != chain_id:
+        raise ValueError(f"{spool_path} was not signed for {chain_config['name']} (chain id {chain_id})")
+    tracker = get_tracker()
+    # Only group what wait_group will collect; the tracker forgets groups there.
+    group = f"spool:{spool_path}:{time.time()}" if wait else None
+
+    def on_sent(entry):
+        get_registry().add_transaction(entry["hash"], chain_id, header["from"], "spool")
+        tracker.track(rpc_url, entry["hash"], group, {"chain_id": chain_id, "from": header["from"], "kind": "spool"})
+
+    print(f"[+] Broadcasting {spool_path}" + (f" at up to {rate} tx/s" if rate else "") + "...")
+    stats = broadcast_spool(spool_path, rpc_url, rate, batch_size, on_sent=on_sent)
+    # The spool used nonces without the nonce manager; realign a lane this process holds.
+    if rpc_url in _WEB3_CACHE:
+        NONCES.resync(_WEB3_CACHE[rpc_url], chain_id, header["from"])
+    print(f"[✓] {stats['sent']} sent, {stats['skipped']} sent before, {stats['failed']} failed")
+    if wait and stats["sent"]:
+        print("[+] Waiting for receipts...")
+        try:
+            txs = tracker.wait_group(group, RECEIPT_TIMEOUT + stats["sent"])
+        except TimeoutError as e:
+            print(f"[!] {e}; check later with the wait command")
+            return stats
+        bad = [tx for tx in txs if tx.status != "success"]
+        for tx in bad:
+            print(f"[!] {tx.hash} {tx.status}")
+        print(f"[✓] {len(txs) - len(bad)}/{len(txs)} transactions succeeded")
+    return stats
+
+def prompt_bulk_send(w3, acct, chain_id, contract_address, private_key):
+    action = get_input("Bulk action, 'mint' or 'transfer' (or 'b' to go back): ")
+    if action is None:
+        return
+    if action.lower() not in BULK_BUILDERS:
+        print("[!] Invalid action.")
+        return
+    path = get_input("Enter the recipients file, CSV or JSONL (or 'b' to go back): ")
+    if path is None:
+        return
+    if not os.path.exists(path):
+        print(f"[!] File not found: {path}")
+        return
+    bulk_send(w3, acct, chain_id, contract_address, private_key, path, action.lower())
 
 def post_deployment_actions(w3, acct, chain_id, contract_address, private_key):
     while True:
@@ -439,24 +1155,522 @@ def post_deployment_actions(w3, acct, chain_id, contract_address, private_key):
         print("2. Burn tokens")
         print("3. Renounce ownership")
         print("4. Transfer tokens")
+        print("5. Bulk mint / airdrop from file")
         print("b. Back to previous menu")
-        choice = get_input("Select an action (1-4) or 'b' to go back: ")
+        choice = get_input("Select an action (1-5) or 'b' to go back: ")
         if choice is None:
             print("Returning to previous menu...")
             break
-        if choice == "1":
-            mint_tokens(w3, acct, chain_id, contract_address, private_key)
-        elif choice == "2":
-            burn_tokens(w3, acct, chain_id, contract_address, private_key)
-        elif choice == "3":
-            renounce_ownership(w3, acct, chain_id, contract_address, private_key)
-        elif choice == "4":
-            transfer_tokens(w3, acct, chain_id, contract_address, private_key)
+        # Gas estimation runs every call first, so a call that would revert
+        # (not the owner, renounced, amount above the balance) raises here.
+        try:
+            if choice == "1":
+                mint_tokens(w3, acct, chain_id, contract_address, private_key)
+            elif choice == "2":
+                burn_tokens(w3, acct, chain_id, contract_address, private_key)
+            elif choice == "3":
+                renounce_ownership(w3, acct, chain_id, contract_address, private_key)
+            elif choice == "4":
+                transfer_tokens(w3, acct, chain_id, contract_address, private_key)
+            elif choice == "5":
+                prompt_bulk_send(w3, acct, chain_id, contract_address, private_key)
+            else:
+                print("[!] Invalid choice. Please select a valid option.")
+        except Exception as e:
+            print(f"[!] Action failed: {e}")
+
+# ----------------------------------------------------------------------
+# 7) MULTI-CHAIN FAN-OUT DEPLOYMENT
+# ----------------------------------------------------------------------
+
+def _deploy_to_chain(chain_config, private_key, token_name, symbol, deployer, verify=False):
+    """
+    Deploy an already compiled token to a single chain and record it.
+    Returns a result dict with the chain name, address and latency.
+    """
+    chain_name = chain_config["name"]
+    set_labels(chain=chain_name)
+    started = time.perf_counter()
+    try:
+        # Chain id, nonce and balance in a single batched request before spending anything.
+        from rpc import account_snapshot
+        snapshot = account_snapshot(chain_config["RPC_URL"], [deployer])
+        check_chain_id(chain_config, snapshot["chain_id"])
+        if not snapshot["accounts"][deployer]["balance"]:
+            raise ValueError(f"deployer {deployer} has no funds")
+        contract_address = deploy_contract(chain_config["RPC_URL"], private_key, token_name, symbol=symbol,
+                                           chain_id=int(chain_config["CHAIN_ID"]))
+        error = None if contract_address else "deployment failed"
+    except Exception as e:
+        contract_address, error = None, str(e)
+    if contract_address:
+        store_contract_info(chain_name, token_name, contract_address, deployer, "unverified")
+        if verify:
+            queue_verification(chain_config, token_name, contract_address, deployer)
+    return {
+        "chain": chain_name,
+        "address": contract_address,
+        "error": error,
+        "latency": time.perf_counter() - started,
+    }
+
+def deploy_to_chains(private_key, token_name, symbol, chain_names=None, max_workers=None, verify=False):
+    """
+    Deploy one token to every chain in chains.txt (or the given subset) at the
+    same time. The contract is generated and compiled once, then each chain
+    gets its own deployment worker and its own row in the registry.
+    With verify=True every deployment is handed to the verification queue.
+    Returns the list of per-chain result dicts.
+    """
+    chains = load_chains()
+    if chain_names:
+        missing = [n for n in chain_names if n not in chains]
+        if missing:
+            print(f"[!] Unknown chain(s): {', '.join(missing)}")
+            return []
+        targets = [chains[n] for n in chain_names]
+    else:
+        targets = list(chains.values())
+    if not targets:
+        print("[!] No chains found in chains.txt")
+        return []
+
+    deployer = get_account(private_key).address
+    token_name = token_name.replace(" ", "_")
+    with _BUILD_LOCK:
+        generate_contract(token_name, symbol)
+        compile_contract()
+
+    print(f"[+] Deploying {token_name} to {len(targets)} chain(s)...")
+    started = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers or len(targets)) as pool:
+        futures = [pool.submit(bind(_deploy_to_chain), c, private_key, token_name, symbol, deployer, verify) for c in targets]
+        for future in as_completed(futures):
+            results.append(future.result())
+    total = time.perf_counter() - started
+
+    print_fanout_summary(results, total)
+    return results
+
+def print_fanout_summary(results, total):
+    print("\n=== Fan-out Deployment Summary ===")
+    for r in sorted(results, key=lambda r: r["chain"]):
+        if r["address"]:
+            print(f"[✓] {r['chain']:<12} {r['latency']:7.2f}s  {r['address']}")
+        else:
+            print(f"[!] {r['chain']:<12} {r['latency']:7.2f}s  {r['error']}")
+    ok = sum(1 for r in results if r["address"])
+    print(f"{ok}/{len(results)} chains succeeded in {total:.2f}s")
+
+def predict_address(token_name, symbol, deployer, chain_names=None, check=False):
+    """
+    Print the CREATE2 address a token would get from the current build. Only
+    needs a compile; with check=True every chain (or the given subset) is
+    asked whether the token or the deployment proxy is already there.
+    """
+    token_name = token_name.replace(" ", "_")
+    with _BUILD_LOCK:
+        generate_contract(token_name, symbol)
+        compile_contract()
+    address = create2_plan(token_name, symbol, deployer)[2]
+    print(f"[✓] {token_name} ({symbol}) from {deployer}: {address}")
+    if not check:
+        return address
+
+    from create2 import DETERMINISTIC_DEPLOYER, deployed
+    chains = load_chains()
+    names = chain_names or sorted(chains)
+
+    def lookup(name):
+        with labels(chain=name):
+            return deployed(chains[name]["RPC_URL"], [DETERMINISTIC_DEPLOYER, address])
+
+    with ThreadPoolExecutor(max_workers=max(1, len(names))) as pool:
+        futures = {pool.submit(lookup, n): n for n in names if n in chains}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                has_code = future.result()
+            except Exception as e:
+                print(f"[!] {name:<12} {e}")
+                continue
+            if has_code[address]:
+                print(f"[✓] {name:<12} deployed")
+            elif has_code[DETERMINISTIC_DEPLOYER]:
+                print(f"[+] {name:<12} not deployed yet")
+            else:
+                print(f"[!] {name:<12} no deterministic deployment proxy")
+    for name in names:
+        if name not in chains:
+            print(f"[!] {name:<12} not in chains.txt")
+    return address
+
+def registry_targets(chain_names=None, deployer=None):
+    """
+    Group registry deployments by chain for the dashboard and the indexer:
+    {chain name: (RPC_URL, [deployment dicts])}. Chains missing from
+    chains.txt are reported and skipped.
+    """
+    chains = load_chains()
+    targets, unknown = {}, set()
+    for d in get_registry().all_deployments(deployer=deployer):
+        if chain_names and d["chain"] not in chain_names:
+            continue
+        if d["chain"] not in chains:
+            unknown.add(d["chain"])
+            continue
+        targets.setdefault(d["chain"], (chains[d["chain"]]["RPC_URL"], []))[1].append(d)
+    for name in sorted(unknown):
+        print(f"[!] Skipping tokens on '{name}': not in chains.txt")
+    return targets
+
+def index_transfers(chain_names=None, max_workers=None):
+    """
+    Bring the holders table up to date from the Transfer logs of every
+    registered token. Each chain continues from its own checkpoint; all
+    chains are indexed in parallel. Returns {chain name: stats}.
+    """
+    from indexer import index_chains
+    targets = registry_targets(chain_names)
+    if not targets:
+        print("[!] No deployed tokens found in the registry")
+        return {}
+    print(f"[+] Indexing Transfer logs of {sum(len(d) for _, d in targets.values())} token(s) on {len(targets)} chain(s)...")
+    started = time.perf_counter()
+    results = index_chains(get_registry(), targets, max_workers)
+    for name, r in sorted(results.items()):
+        if "error" in r:
+            print(f"[!] {name:<12} {r['error']}")
+        elif r["from"] is None:
+            print(f"[✓] {name:<12} up to date at block {r['to']}")
         else:
-            print("[!] Invalid choice. Please select a valid option.")
+            print(f"[✓] {name:<12} blocks {r['from']}-{r['to']}: {r['logs']} transfer(s)")
+    print(f"Indexed in {time.perf_counter() - started:.2f}s")
+    return results
+
+def show_holders(chain_name, token, limit=20):
+    """
+    Print the largest holders of a token (name or address) from the local
+    index. The only RPC call is the token's decimals(); balances are shown
+    in base units when it cannot be read.
+    """
+    matches = [d for d in get_registry().all_deployments(chain=chain_name)
+               if token.lower() in (d["token_name"].lower(), d["address"].lower())]
+    if not matches:
+        print(f"[!] No token '{token}' on {chain_name} in the registry")
+        return False
+    registry = get_registry()
+    chain_config = load_chains().get(chain_name)
+    for d in matches:
+        decimals = None
+        if chain_config is not None:
+            try:
+                from rpc import get_pool
+                codec = token_codec()
+                decimals = codec.decode("decimals", get_pool(chain_config["RPC_URL"]).call(
+                    "eth_call", [{"to": d["address"], "data": "0x" + codec.encode("decimals").hex()}, "latest"]))
+            except Exception as e:
+                print(f"[!] Could not read decimals() of {d['address']}, showing base units: {e}")
+        holders = registry.holders(chain_name, d["address"], limit)
+        print(f"\n=== {d['token_name']} at {d['address']} on {chain_name}: "
+              f"{registry.holder_count(chain_name, d['address'])} holder(s) ===")
+        for holder, balance in holders:
+            if not decimals:
+                print(f"{holder}  {balance:,}" + (" (base units)" if decimals is None else ""))
+                continue
+            whole, frac = divmod(balance, 10 ** decimals)
+            frac = f"{frac:0{decimals}d}".rstrip("0")
+            print(f"{holder}  {whole:,}.{frac}" if frac else f"{holder}  {whole:,}")
+    return True
+
+def show_dashboard(chain_names=None, deployer=None, max_workers=None):
+    """
+    Print the on-chain state (total supply, owner, deployer token and native
+    balance) of every token in the registry, optionally only for some chains
+    and / or one deployer. Reads are grouped per chain into Multicall3 or
+    JSON-RPC batch requests and all chains are read in parallel.
+    Returns {chain name: result dict} from dashboard.read_chains.
+    """
+    from dashboard import read_chains, print_dashboard
+    targets = registry_targets(chain_names, deployer)
+    if not targets:
+        print("[!] No deployed tokens found in the registry")
+        return {}
+    total = sum(len(deps) for _, deps in targets.values())
+    print(f"[+] Reading {total} token(s) on {len(targets)} chain(s)...")
+    started = time.perf_counter()
+    results = read_chains(targets, max_workers)
+    print_dashboard(results)
+    print(f"\nRead in {time.perf_counter() - started:.2f}s")
+    return results
 
 # ----------------------------------------------------------------------
-# 7) MAIN PROGRAM: NESTED LOOPS
+# 8) HEADLESS JOB RUNNER
+# ----------------------------------------------------------------------
+
+# Fields every job of an operation must provide besides "op", "key" and "chain".
+JOB_FIELDS = {
+    "deploy": ("name", "symbol"),
+    "verify": ("name", "contract"),
+    "mint": ("contract", "to", "amount"),
+    "burn": ("contract", "amount"),
+    "transfer": ("contract", "to", "amount"),
+    "renounce": ("contract",),
+}
+
+def run_job(job):
+    """
+    Execute one job dict with the same functions the interactive menu uses.
+    Returns a result value (address or tx hash); raises on failure.
+    """
+    op = job.get("op")
+    if op not in JOB_FIELDS:
+        raise ValueError(f"unknown op '{op}'")
+    missing = [f for f in ("key", "chain") + JOB_FIELDS[op] if job.get(f) in (None, "")]
+    if missing:
+        raise ValueError(f"missing field(s): {', '.join(missing)}")
+    keys = load_keys()
+    chains = load_chains()
+    if job["key"] not in keys:
+        raise ValueError(f"key '{job['key']}' not found in keys.txt")
+    if job["chain"] not in chains:
+        raise ValueError(f"chain '{job['chain']}' not found in chains.txt")
+
+    private_key = keys[job["key"]]
+    chain_config = chains[job["chain"]]
+    rpc_url = chain_config["RPC_URL"]
+    chain_id = int(chain_config["CHAIN_ID"])
+    check_chain_id(chain_config)
+    w3, acct = init_web3(rpc_url, private_key)
+
+    if op == "deploy":
+        token_name = str(job["name"]).replace(" ", "_")
+        with _BUILD_LOCK:
+            generate_contract(token_name, job["symbol"])
+            compile_contract()
+        contract_address = deploy_contract(rpc_url, private_key, token_name, symbol=job["symbol"], chain_id=chain_id)
+        if not contract_address:
+            raise RuntimeError("deployment failed")
+        store_contract_info(chain_config["name"], token_name, contract_address, acct.address, "unverified")
+        if job.get("verify"):
+            queue_verification(chain_config, token_name, contract_address, acct.address)
+        return contract_address
+
+    contract_address = normalize_address(w3, job["contract"])
+    if contract_address is None:
+        raise ValueError(f"invalid contract address '{job['contract']}'")
+    if op == "verify":
+        if not verify_contract(rpc_url, chain_config, job["name"], contract_address, acct.address, confirm=False):
+            raise RuntimeError("verification failed")
+        return contract_address
+    if op in ("mint", "transfer"):
+        recipient = normalize_address(w3, job["to"])
+        if recipient is None:
+            raise ValueError(f"invalid recipient address '{job['to']}'")
+        action = mint_tokens if op == "mint" else transfer_tokens
+        return action(w3, acct, chain_id, contract_address, private_key, recipient, str(job["amount"]))
+    if op == "burn":
+        return burn_tokens(w3, acct, chain_id, contract_address, private_key, str(job["amount"]))
+    return renounce_ownership(w3, acct, chain_id, contract_address, private_key)
+
+def run_jobs(jobs, results_path=None, per_key=1, per_chain=4, max_workers=8):
+    """
+    Run (line, job) pairs through a worker pool. At most `per_key` jobs use
+    the same key and `per_chain` jobs the same chain at any time. Every result
+    is appended to results_path as one JSON line as soon as it is known.
+    Returns the list of result dicts.
+    """
+    existing = {}
+    if DEPLOY_CREATE2:
+        try:
+            existing = create2_precheck(jobs)
+        except Exception as e:
+            print(f"[!] CREATE2 pre-check failed, every deploy job checks on its own: {e}")
+    # One queue per key, in file order. A job is handed to a worker only when
+    # its key and chain have a free slot, so jobs waiting on a busy key never
+    # hold a worker thread that another key could use.
+    queues = {}
+    for line, job in jobs:
+        queues.setdefault(job.get("key"), deque()).append((line, job))
+    active_keys, active_chains = defaultdict(int), defaultdict(int)
+    running = [0]
+    ready = threading.Condition()
+    results_lock = threading.Lock()
+    results = []
+    out = open(results_path, "a") if results_path else None
+
+    def next_job():
+        for key, queue in queues.items():
+            if queue and active_keys[key] < per_key and active_chains[queue[0][1].get("chain")] < per_chain:
+                return queue.popleft()
+        return None
+
+    def execute(line, job):
+        started = time.perf_counter()
+        result = {"line": line, "op": job.get("op"), "key": job.get("key"), "chain": job.get("chain")}
+        try:
+            with labels(key=job.get("key"), chain=job.get("chain")):
+                try:
+                    result.update(ok=True, result=existing[line] if line in existing else run_job(job), error=None)
+                except Exception as e:
+                    result.update(ok=False, result=None, error=str(e))
+            result["seconds"] = round(time.perf_counter() - started, 3)
+            with results_lock:
+                results.append(result)
+                if out:
+                    out.write(json.dumps(result) + "\n")
+                    out.flush()
+                mark = "✓" if result["ok"] else "!"
+                print(f"[{mark}] job {line} {result['op']} on {result['chain']} ({result['key']}): "
+                      f"{result['result'] or result['error']}")
+        finally:
+            with ready:
+                active_keys[job.get("key")] -= 1
+                active_chains[job.get("chain")] -= 1
+                running[0] -= 1
+                ready.notify_all()
+        return result
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            with ready:
+                while any(queues.values()):
+                    item = next_job() if running[0] < max_workers else None
+                    if item is None:
+                        ready.wait()
+                        continue
+                    line, job = item
+                    active_keys[job.get("key")] += 1
+                    active_chains[job.get("chain")] += 1
+                    running[0] += 1
+                    pool.submit(execute, line, job)
+    finally:
+        if out:
+            out.close()
+    return results
+
+def create2_precheck(jobs):
+    """
+    Predict the address of every CREATE2 deploy job (one compile for all of
+    them) and look them up with one batched eth_getCode per chain. Tokens
+    that already exist are recorded in the registry; returns {line: address}
+    for their jobs so they are not sent again.
+    """
+    from create2 import deployed
+    keys, chains = load_keys(), load_chains()
+    plans = [(line, job, str(job["name"]).replace(" ", "_")) for line, job in jobs
+             if job.get("op") == "deploy" and job.get("key") in keys and job.get("chain") in chains
+             and job.get("name") and job.get("symbol")]
+    if not plans:
+        return {}
+    # Anything that goes wrong here leaves the jobs to run_job, which reports
+    # the error per job.
+    try:
+        with _BUILD_LOCK:
+            for _, job, token_name in plans:
+                generate_contract(token_name, job["symbol"])
+            compile_contract()
+    except Exception as e:
+        print(f"[!] CREATE2 pre-check skipped, build failed: {e}")
+        return {}
+
+    by_chain = {}
+    for line, job, token_name in plans:
+        try:
+            deployer = get_account(keys[job["key"]]).address
+            address = create2_plan(token_name, job["symbol"], deployer)[2]
+        except Exception as e:
+            print(f"[!] CREATE2 pre-check skipped for job {line}: {e}")
+            continue
+        by_chain.setdefault(job["chain"], []).append((line, token_name, address, deployer))
+    existing = {}
+    for chain_name, items in by_chain.items():
+        try:
+            has_code = deployed(chains[chain_name]["RPC_URL"], [address for _, _, address, _ in items])
+        except Exception as e:
+            print(f"[!] Could not check existing deployments on {chain_name}: {e}")
+            continue
+        for line, token_name, address, deployer in items:
+            if has_code.get(address):
+                store_contract_info(chain_name, token_name, address, deployer, "unverified")
+                existing[line] = address
+    print(f"[+] {len(existing)} of {len(plans)} CREATE2 deployments already exist and are skipped")
+    return existing
+
+def load_jobs(path):
+    """
+    Read a JSONL job file. Returns [(line_number, job dict)]; lines that are
+    not valid JSON objects become jobs that fail with a parse error.
+    """
+    jobs = []
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("not an object")
+            except ValueError as e:
+                job = {"op": f"<invalid: {e}>"}
+            jobs.append((line_number, job))
+    return jobs
+
+def build_key_jobs(op, chain_name, key_labels=None, **params):
+    """
+    Expand one operation into a job per key in keys.txt (or the given key_labels).
+    String params may contain {label}, e.g. name="Token_{label}".
+    renounce and verify without a contract expand to every matching token the
+    key deployed on chain_name according to the registry.
+    """
+    keys = load_keys()
+    key_labels = key_labels or list(keys.keys())
+    unknown = [l for l in key_labels if l not in keys]
+    if unknown:
+        raise ValueError(f"key(s) not found in keys.txt: {', '.join(unknown)}")
+
+    jobs = []
+    for label in key_labels:
+        base = {"op": op, "key": label, "chain": chain_name}
+        for field, value in params.items():
+            if value is not None:
+                base[field] = value.format(label=label) if isinstance(value, str) else value
+        if op in ("renounce", "verify") and "contract" not in base:
+            deployer = get_account(keys[label]).address
+            for token_name, address, status in list_contract_info(chain_name, deployer):
+                if op == "verify" and status.lower() != "unverified":
+                    continue
+                jobs.append(dict(base, contract=address, name=token_name))
+        else:
+            jobs.append(base)
+    return list(enumerate(jobs, start=1))
+
+def run_for_keys(op, chain_name, key_labels=None, results_path=None, per_chain=4, max_workers=8, **params):
+    """
+    Run the same operation for many keys at once. Each key is its own lane
+    (one job at a time, its own nonces), so a failing key never holds up or
+    breaks the others. Returns the collected result dicts.
+    """
+    jobs = build_key_jobs(op, chain_name, key_labels, **params)
+    if not jobs:
+        print(f"[!] Nothing to {op} on {chain_name} for the selected keys")
+        return []
+    print(f"[+] Running {len(jobs)} {op} job(s) on {chain_name} across {len({j['key'] for _, j in jobs})} key(s)...")
+    results = run_jobs(jobs, results_path, per_key=1, per_chain=per_chain, max_workers=max_workers)
+
+    print("\n=== Multi-key Summary ===")
+    by_key = {}
+    for r in results:
+        ok, total = by_key.get(r["key"], (0, 0))
+        by_key[r["key"]] = (ok + r["ok"], total + 1)
+    for label, (ok, total) in sorted(by_key.items()):
+        print(f"[{'✓' if ok == total else '!'}] {label:<12} {ok}/{total} succeeded")
+    return results
+
+# ----------------------------------------------------------------------
+# 9) MAIN PROGRAM: NESTED LOOPS
 # ----------------------------------------------------------------------
 
 def main():
@@ -478,6 +1692,11 @@ def main():
             rpc_url = chain_config["RPC_URL"]
             chain_id = int(chain_config["CHAIN_ID"])
             chain_name = chain_config["name"]
+            try:
+                check_chain_id(chain_config)
+            except Exception as e:
+                print(f"[!] {e}")
+                continue
 
             # Initialize web3 + account (deployer)
             w3, acct = init_web3(rpc_url, private_key)
@@ -495,11 +1714,15 @@ def main():
                     print("b. Back to chain selection")
                     print("Or press Enter to deploy a new token.")
                                                                                                                                                                                                  
-                choice = get_input("Select a token index to resume, 'b' to go back, or Enter to deploy new: ", allow_back=True)
+                choice = get_input("Select a token index to resume, 'd' for on-chain details, 'b' to go back, or Enter to deploy new: ", allow_back=True)
                 if choice is None:                                                                                                                                                                   
                     print("Returning to chain selection...\n")
                     break
 
+                if choice.lower() == "d":
+                    show_dashboard([chain_name], deployer)
+                    continue
+
                 if choice == "":
                     # Deploy new token                                                                                                                                                               
                     token_name = get_input("Enter your smart contract name (or 'b' to go back): ")
@@ -515,7 +1738,7 @@ def main():
 
                     generate_contract(token_name, symbol)
                     compile_contract()
-                    contract_address = deploy_contract(rpc_url, private_key, token_name)
+                    contract_address = deploy_contract(rpc_url, private_key, token_name, symbol=symbol, chain_id=chain_id)
                     if contract_address:
                         store_contract_info(chain_name, token_name, contract_address, deployer, "unverified")
                         verify_contract(rpc_url, chain_config, token_name, contract_address, deployer)
@@ -548,8 +1771,378 @@ def main():
     print("Exiting program. Goodbye!")
 
 # ----------------------------------------------------------------------
-# 8) ENTRY POINT
+# 10) ENTRY POINT
 # ----------------------------------------------------------------------
 
+def key_by_label(label):
+    keys = load_keys()
+    if label not in keys:
+        print(f"[!] Key '{label}' not found in keys.txt")
+        exit(1)
+    return keys[label]
+
+def chain_by_name(name):
+    chains = load_chains()
+    if name not in chains:
+        print(f"[!] Chain '{name}' not found in chains.txt")
+        exit(1)
+    return chains[name]
+
+def split_list(value):
+    return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Deploy and manage ERC20 tokens. Runs the interactive menu when no command is given.")
+    parser.add_argument("--parametrized", action="store_true",
+                        help="deploy every token from one shared build with constructor arguments")
+    parser.add_argument("--forge", action="store_true",
+                        help="deploy with forge create instead of signing the creation transaction in-process")
+    parser.add_argument("--create2", action="store_true",
+                        help="deploy through the deterministic deployment proxy at an address derived from name, symbol and deployer; existing tokens are skipped")
+    parser.add_argument("--gas-profile", choices=sorted(PROFILES),
+                        help="fee speed profile (default: GAS_PROFILE env or 'normal')")
+    parser.add_argument("--quiet", action="store_true", help="do not print the banner (or set DEPLOY_QUIET=1)")
+    parser.add_argument("--fast", action="store_true", help="print the banner instantly (or set DEPLOY_FAST=1)")
+    parser.add_argument("--startup-report", action="store_true", help="print how long each startup phase took on exit")
+    parser.add_argument("--rpc-stats", action="store_true", help="print per-endpoint RPC counts and latency on exit")
+    parser.add_argument("--verify-wait", type=float, default=120,
+                        help="seconds to keep running queued verifications, including ones still in their start delay, before a command exits (default 120)")
+    parser.add_argument("--trace", default=os.environ.get("DEPLOY_TRACE"),
+                        help="append one JSON line per timed phase (build, deploy, verify, RPC call, signing, sending) to this file")
+    parser.add_argument("--metrics", default=os.environ.get("DEPLOY_METRICS"),
+                        help="write phase timings to this file in Prometheus text format, e.g. for the node exporter")
+    parser.add_argument("--confirmations", type=int,
+                        help="blocks on top of a transaction before it counts as final (default: CONFIRMATIONS env or 1)")
+    parser.add_argument("--bump-after", type=float,
+                        help="replace a transaction with bumped fees after this many seconds without a receipt (default: BUMP_AFTER env or off)")
+    parser.add_argument("--fee-ceiling-gwei", type=float,
+                        help="highest max fee / gas price a replacement may pay (default: FEE_CEILING_GWEI env or 4x the first fee)")
+    sub = parser.add_subparsers(dest="command")
+
+    fanout = sub.add_parser("fanout", help="deploy one token to several chains at the same time")
+    fanout.add_argument("--key", default="default", help="key label from keys.txt")
+    fanout.add_argument("--name", required=True, help="token / contract name")
+    fanout.add_argument("--symbol", required=True, help="token symbol")
+    fanout.add_argument("--chains", help="comma separated chain names (default: every chain in chains.txt)")
+    fanout.add_argument("--workers", type=int, help="max parallel deployments (default: one per chain)")
+    fanout.add_argument("--verify", action="store_true", help="queue every deployment for background verification")
+
+    airdrop = sub.add_parser("airdrop", help="mint or transfer to every row of a CSV / JSONL recipients file")
+    airdrop.add_argument("--key", default="default", help="key label from keys.txt")
+    airdrop.add_argument("--chain", required=True, help="chain name from chains.txt")
+    airdrop.add_argument("--contract", required=True, help="token contract address")
+    airdrop.add_argument("--file", required=True, help="recipients file with address,amount rows")
+    airdrop.add_argument("--action", choices=sorted(BULK_BUILDERS), default="mint")
+    airdrop.add_argument("--window", type=int, default=16, help="max unconfirmed transactions in flight")
+    airdrop.add_argument("--checkpoint", help="checkpoint file (default: <file>.checkpoint)")
+
+    presign = sub.add_parser("presign", help="sign a mint / transfer per recipients-file row into a spool, offline if nonce and fees are given")
+    presign.add_argument("--key", default="default", help="key label from keys.txt")
+    presign.add_argument("--chain", required=True, help="chain name from chains.txt")
+    presign.add_argument("--contract", required=True, help="token contract address")
+    presign.add_argument("--file", required=True, help="recipients file with address,amount rows")
+    presign.add_argument("--action", choices=sorted(BULK_BUILDERS), default="mint")
+    presign.add_argument("--out", help="spool file (default: <file>.spool)")
+    presign.add_argument("--nonce", type=int, help="first nonce (default: the account's pending nonce from the RPC)")
+    presign.add_argument("--max-fee-gwei", type=float, help="EIP-1559 max fee per gas")
+    presign.add_argument("--priority-fee-gwei", type=float, help="EIP-1559 priority fee per gas")
+    presign.add_argument("--gas-price-gwei", type=float, help="legacy gas price, for chains without EIP-1559")
+    presign.add_argument("--gas", type=int, help=f"gas limit per transaction (default {SPOOL_GAS})")
+    presign.add_argument("--workers", type=int, help="signing processes (default: one per CPU)")
+    presign.add_argument("--decimals", type=int, help="token decimals for transfers (default: read from the token)")
+
+    broadcast = sub.add_parser("broadcast", help="send the transactions of a spool made by presign")
+    broadcast.add_argument("--chain", required=True, help="chain name from chains.txt")
+    broadcast.add_argument("spool", help="spool file")
+    broadcast.add_argument("--rate", type=float, help="max transactions per second (default: no limit)")
+    broadcast.add_argument("--batch", type=int, default=20, help="transactions per JSON-RPC batch (default 20)")
+    broadcast.add_argument("--no-wait", action="store_true", help="do not wait for receipts")
+
+    run = sub.add_parser("run", help="run a JSONL job file without any prompts")
+    run.add_argument("jobs", help="job file, one JSON object per line")
+    run.add_argument("--results", help="append one JSON result line per job to this file")
+    run.add_argument("--per-key", type=int, default=1, help="max concurrent jobs per key (default 1)")
+    run.add_argument("--per-chain", type=int, default=4, help="max concurrent jobs per chain (default 4)")
+    run.add_argument("--workers", type=int, default=8, help="worker threads (default 8)")
+
+    multikey = sub.add_parser("multikey", help="run one operation for every key (or a labelled subset) in parallel")
+    multikey.add_argument("--op", required=True, choices=sorted(JOB_FIELDS))
+    multikey.add_argument("--chain", required=True, help="chain name from chains.txt")
+    multikey.add_argument("--keys", help="comma separated key labels (default: every key in keys.txt)")
+    multikey.add_argument("--name", help="token name for deploy / verify, may contain {label}")
+    multikey.add_argument("--symbol", help="token symbol for deploy, may contain {label}")
+    multikey.add_argument("--contract", help="token address (renounce / verify default to every token of the key)")
+    multikey.add_argument("--to", help="recipient for mint / transfer")
+    multikey.add_argument("--amount", help="amount for mint / burn / transfer")
+    multikey.add_argument("--verify", action="store_true", help="verify after deploying")
+    multikey.add_argument("--results", help="append one JSON result line per job to this file")
+    multikey.add_argument("--per-chain", type=int, default=4, help="max concurrent jobs on the chain (default 4)")
+    multikey.add_argument("--workers", type=int, default=8, help="worker threads (default 8)")
+
+    verify_worker = sub.add_parser("verify-worker", help="process the queued verifications until none are left")
+    verify_worker.add_argument("--timeout", type=float, help="stop after this many seconds")
+
+    index = sub.add_parser("index", help="update the local holder balances from Transfer logs")
+    index.add_argument("--chains", help="comma separated chain names (default: every chain)")
+    index.add_argument("--workers", type=int, help="max chains indexed in parallel (default: all)")
+
+    holders = sub.add_parser("holders", help="show the largest holders of a token from the local index")
+    holders.add_argument("--chain", required=True, help="chain name from chains.txt")
+    holders.add_argument("--token", required=True, help="token name or address")
+    holders.add_argument("--top", type=int, default=20, help="holders to show (default 20)")
+
+    predict = sub.add_parser("predict", help="print the CREATE2 address of a token without sending anything")
+    predict.add_argument("--name", required=True, help="token / contract name")
+    predict.add_argument("--symbol", required=True, help="token symbol")
+    predict.add_argument("--key", default="default", help="key label from keys.txt")
+    predict.add_argument("--deployer", help="deployer address (instead of --key)")
+    predict.add_argument("--check", action="store_true", help="also look the address up on every chain")
+    predict.add_argument("--chains", help="comma separated chain names for --check (default: every chain)")
+
+    dashboard = sub.add_parser("dashboard", help="show supply, owner and balances of every registered token")
+    dashboard.add_argument("--chains", help="comma separated chain names (default: every chain)")
+    dashboard.add_argument("--key", help="only tokens deployed by this key label")
+    dashboard.add_argument("--deployer", help="only tokens deployed by this address")
+    dashboard.add_argument("--workers", type=int, help="max chains read in parallel (default: all)")
+
+    unstick = sub.add_parser("unstick", help="replace a key's pending transactions with bumped fees until they are mined")
+    unstick.add_argument("--key", default="default", help="key label from keys.txt")
+    unstick.add_argument("--chain", required=True, help="chain name from chains.txt")
+    unstick.add_argument("--after", type=float, help="only transactions without a receipt for this many seconds (default 90)")
+    unstick.add_argument("--timeout", type=float, help="give up after this many seconds")
+
+    wait = sub.add_parser("wait", help="wait until transactions are final and record them in the registry")
+    wait.add_argument("--chain", required=True, help="chain name from chains.txt")
+    wait.add_argument("--timeout", type=float, help="give up after this many seconds")
+    wait.add_argument("tx_hashes", nargs="+", help="transaction hashes")
+    return parser
+
+def wait_for_transactions(chain_config, tx_hashes, timeout=None):
+    """
+    Track the given hashes as one group and block until all of them are final.
+    """
+    tracker = get_tracker()
+    group = f"wait:{time.time()}"
+    for tx_hash in tx_hashes:
+        get_registry().add_transaction(tx_hash, int(chain_config["CHAIN_ID"]))
+        tracker.track(chain_config["RPC_URL"], tx_hash, group, {"chain_id": int(chain_config["CHAIN_ID"])})
+    try:
+        txs = tracker.wait_group(group, timeout)
+    except TimeoutError as e:
+        print(f"[!] {e}")
+        return False
+    for tx in txs:
+        print(f"[{'✓' if tx.status == 'success' else '!'}] {tx.hash} {tx.status} "
+              f"(block {tx.block_number}, gas used {tx.gas_used})")
+    return all(tx.status == "success" for tx in txs)
+
+def unstick_transactions(chain_config, private_key, stuck_after=None, timeout=None):
+    """
+    Replace the key's transactions on a chain that the registry still has as
+    pending and that have had no receipt for `stuck_after` seconds, bumping
+    again each round until every nonce is mined or at its fee ceiling.
+    Prints which version of each transaction landed.
+    """
+    from rpc import get_pool
+    from fee_bumper import STUCK_AFTER
+    check_chain_id(chain_config)
+    rpc_url = chain_config["RPC_URL"]
+    chain_id = int(chain_config["CHAIN_ID"])
+    w3, acct = init_web3(rpc_url, private_key)
+    rows = [t for t in get_registry().transactions("pending")
+            if t["chain_id"] == chain_id and (t["sender"] or "").lower() == acct.address.lower()]
+    found = get_pool(rpc_url).batch([("eth_getTransactionByHash", [t["hash"]]) for t in rows]) if rows else []
+    # Rows of earlier replacements share a nonce; follow the newest version the node still has.
+    latest = {}
+    for row, tx in zip(rows, found):
+        if isinstance(tx, dict) and not tx.get("blockNumber"):
+            latest[int(tx["nonce"], 16)] = row
+    if not latest:
+        print(f"[✓] No pending transactions from {acct.address} on {chain_config['name']}")
+        return True
+
+    stuck_after = STUCK_AFTER if stuck_after is None else stuck_after
+    tracker = get_tracker()
+    bumper = get_fee_bumper(tracker, stuck_after)
+    bumper.stuck_after = stuck_after
+    group = f"unstick:{time.time()}"
+    txs = []
+    for nonce in sorted(latest):
+        row = latest[nonce]
+        tx = tracker.track(rpc_url, row["hash"], group, {"chain_id": chain_id, "from": acct.address, "kind": row["kind"]})
+        tx.submitted_at = tx.sent_at = row["submitted_at"]
+        txs.append(tx)
+    print(f"[+] Watching {len(txs)} pending transaction(s), nonces {min(latest)}-{max(latest)}...")
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while any(tx.status == "pending" and not bumper.gave_up(tx) for tx in txs):
+        if deadline is not None and time.monotonic() >= deadline:
+            print("[!] Timed out")
+            break
+        bumper.check()
+        try:
+            tracker.wait_group(group, bumper.interval)
+            break
+        except TimeoutError:
+            pass
+    if all(tx.status != "pending" for tx in txs):
+        try:
+            tracker.wait_group(group, RECEIPT_TIMEOUT)
+        except TimeoutError:
+            pass
+    for tx in txs:
+        landed = "not mined" if tx.landed is None else \
+            ("original" if not tx.replaced else f"replacement {tx.hashes.index(tx.landed)}: {tx.landed}")
+        print(f"[{'✓' if tx.status == 'success' else '!'}] {tx.hash} {tx.status}, {landed}")
+    return all(tx.status == "success" for tx in txs)
+
+def cli(argv=None):
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+    banner(instant=args.fast or os.environ.get("DEPLOY_FAST", "") == "1",
+           quiet=args.quiet or os.environ.get("DEPLOY_QUIET", "") == "1")
+    startup_phase("banner", started)
+    METRICS.configure(args.trace, args.metrics)
+    set_labels(key=getattr(args, "key", None), chain=getattr(args, "chain", None))
+    try:
+        run_command(args)
+    finally:
+        if _VERIFY_QUEUE is not None and args.command != "verify-worker":
+            finish_verifications(args.verify_wait)
+        if args.rpc_stats and "rpc" in sys.modules:
+            from rpc import print_rpc_stats
+            print_rpc_stats()
+        if args.startup_report:
+            print_startup_report()
+        METRICS.close()
+
+def print_startup_report():
+    print("\n=== Startup Timing ===")
+    for phase, seconds in STARTUP_TIMINGS:
+        print(f"{phase:<18} {seconds * 1000:8.1f} ms")
+    print(f"{'total runtime':<18} {(time.perf_counter() - _STARTED) * 1000:8.1f} ms")
+
+def finish_verifications(timeout):
+    """
+    Give background verifications up to `timeout` seconds to finish, then
+    report what is left in the persistent queue.
+    """
+    queue = get_verify_queue()
+    print("[+] Waiting for queued verifications...")
+    queue.wait_idle(timeout)
+    counts = get_registry().verification_counts()
+    left = counts.get("queued", 0) + counts.get("running", 0)
+    if left:
+        print(f"[!] {left} verification(s) still queued; run 'python3 scripts/deploy.py verify-worker' to finish them")
+
+def run_verify_worker(timeout=None):
+    queue = get_verify_queue()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        counts = get_registry().verification_counts()
+        left = counts.get("queued", 0) + counts.get("running", 0)
+        if not left:
+            print(f"[✓] Verification queue empty ({counts.get('done', 0)} done, {counts.get('failed', 0)} failed)")
+            return True
+        if deadline is not None and time.monotonic() >= deadline:
+            print(f"[!] {left} verification(s) still queued")
+            return False
+        time.sleep(1)
+
+def run_command(args):
+    global PARAMETRIZED_BUILD, DEPLOY_WITH_FORGE, DEPLOY_CREATE2, GAS_PROFILE, CONFIRMATIONS, BUMP_AFTER, FEE_CEILING_GWEI
+    CONFIRMATIONS = args.confirmations or CONFIRMATIONS
+    BUMP_AFTER = args.bump_after if args.bump_after is not None else BUMP_AFTER
+    FEE_CEILING_GWEI = args.fee_ceiling_gwei or FEE_CEILING_GWEI
+    GAS_PROFILE = args.gas_profile or GAS_PROFILE
+    PARAMETRIZED_BUILD = PARAMETRIZED_BUILD or args.parametrized
+    DEPLOY_WITH_FORGE = DEPLOY_WITH_FORGE or args.forge
+    DEPLOY_CREATE2 = DEPLOY_CREATE2 or args.create2
+    if args.command is None:
+        main()
+    elif args.command == "fanout":
+        install_foundry_dependencies()
+        results = deploy_to_chains(key_by_label(args.key), args.name, args.symbol,
+                                   split_list(args.chains), args.workers, args.verify)
+        if not results or not all(r["address"] for r in results):
+            sys.exit(1)
+    elif args.command == "airdrop":
+        chain_config = chain_by_name(args.chain)
+        private_key = key_by_label(args.key)
+        try:
+            check_chain_id(chain_config)
+        except Exception as e:
+            print(f"[!] {e}")
+            sys.exit(1)
+        w3, acct = init_web3(chain_config["RPC_URL"], private_key)
+        stats = bulk_send(w3, acct, int(chain_config["CHAIN_ID"]), w3.to_checksum_address(args.contract),
+                          private_key, args.file, args.action, args.window, args.checkpoint)
+        if stats["failed"]:
+            sys.exit(1)
+    elif args.command == "presign":
+        fees = None
+        if args.gas_price_gwei is not None:
+            fees = {"gasPrice": int(args.gas_price_gwei * 10**9)}
+        elif args.max_fee_gwei is not None and args.priority_fee_gwei is not None:
+            fees = {"maxFeePerGas": int(args.max_fee_gwei * 10**9),
+                    "maxPriorityFeePerGas": int(args.priority_fee_gwei * 10**9)}
+        elif args.max_fee_gwei is not None or args.priority_fee_gwei is not None:
+            print("[!] --max-fee-gwei and --priority-fee-gwei go together")
+            sys.exit(1)
+        chain_config = chain_by_name(args.chain)
+        presign_bulk(chain_config, key_by_label(args.key), args.contract, args.file, args.action,
+                     args.out, args.nonce, fees, args.gas, args.workers, args.decimals)
+    elif args.command == "broadcast":
+        try:
+            stats = broadcast_spool_file(chain_by_name(args.chain), args.spool, args.rate, args.batch, not args.no_wait)
+        except ValueError as e:
+            print(f"[!] {e}")
+            sys.exit(1)
+        if stats["failed"]:
+            sys.exit(1)
+    elif args.command == "run":
+        install_foundry_dependencies()
+        results = run_jobs(load_jobs(args.jobs), args.results, args.per_key, args.per_chain, args.workers)
+        failed = sum(1 for r in results if not r["ok"])
+        print(f"{len(results) - failed}/{len(results)} jobs succeeded")
+        if failed:
+            sys.exit(1)
+    elif args.command == "multikey":
+        install_foundry_dependencies()
+        try:
+            results = run_for_keys(args.op, args.chain, split_list(args.keys), args.results, args.per_chain,
+                                   args.workers, name=args.name, symbol=args.symbol, contract=args.contract,
+                                   to=args.to, amount=args.amount, verify=args.verify or None)
+        except ValueError as e:
+            print(f"[!] {e}")
+            sys.exit(1)
+        if not all(r["ok"] for r in results):
+            sys.exit(1)
+    elif args.command == "verify-worker":
+        if not run_verify_worker(args.timeout):
+            sys.exit(1)
+    elif args.command == "predict":
+        install_foundry_dependencies()
+        deployer = args.deployer or get_account(key_by_label(args.key)).address
+        predict_address(args.name, args.symbol, deployer, split_list(args.chains), args.check)
+    elif args.command == "dashboard":
+        deployer = get_account(key_by_label(args.key)).address if args.key else args.deployer
+        results = show_dashboard(split_list(args.chains), deployer, args.workers)
+        if not results or any(r["error"] for r in results.values()):
+            sys.exit(1)
+    elif args.command == "index":
+        results = index_transfers(split_list(args.chains), args.workers)
+        if not results or any("error" in r for r in results.values()):
+            sys.exit(1)
+    elif args.command == "holders":
+        if not show_holders(args.chain, args.token, args.top):
+            sys.exit(1)
+    elif args.command == "unstick":
+        if not unstick_transactions(chain_by_name(args.chain), key_by_label(args.key), args.after, args.timeout):
+            sys.exit(1)
+    elif args.command == "wait":
+        if not wait_for_transactions(chain_by_name(args.chain), args.tx_hashes, args.timeout):
+            sys.exit(1)
+
 if __name__ == "__main__":
-    main()
+    cli()
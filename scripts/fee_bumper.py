@@ -0,0 +1,179 @@
+import time
+import threading
+
+from rpc import get_pool, RPCError
+
+# Transaction pools (geth, erigon, reth, nethermind) only accept a replacement
+# for a pending nonce when it pays at least 10% more in every fee field.
+REPLACEMENT_BUMP = 1.10
+BUMP = 1.125            # what each replacement pays over the version it replaces
+STUCK_AFTER = 90        # seconds without a receipt before a transaction is replaced
+CHECK_INTERVAL = 10
+# Without an explicit ceiling a transaction is bumped up to this multiple of
+# the fee it was first sent with.
+CEILING_MULTIPLIER = 4
+
+
+def fees_of(tx):
+    """
+    Fee fields of a transaction as returned by eth_getTransactionByHash.
+    """
+    if tx.get("maxFeePerGas") is not None:
+        return {"maxFeePerGas": int(tx["maxFeePerGas"], 16),
+                "maxPriorityFeePerGas": int(tx["maxPriorityFeePerGas"], 16)}
+    return {"gasPrice": int(tx["gasPrice"], 16)}
+
+
+def bump_fees(fees, ceiling=None, market=None, bump=BUMP):
+    """
+    Fees for a replacement of a transaction that pays `fees`: `bump` times
+    every field, or the current `market` fees when those are higher, capped
+    at `ceiling` wei. Returns None when the ceiling leaves no room for a
+    replacement the pool would accept.
+    """
+    market = market or {}
+    out = {}
+    for field, value in fees.items():
+        wanted = max(int(value * bump) + 1, market.get(field, 0))
+        if ceiling is not None:
+            wanted = min(wanted, ceiling)
+        if wanted < int(value * REPLACEMENT_BUMP) + 1:
+            return None
+        out[field] = wanted
+    if "maxPriorityFeePerGas" in out:
+        out["maxPriorityFeePerGas"] = min(out["maxPriorityFeePerGas"], out["maxFeePerGas"])
+    return out
+
+
+def replacement_tx(tx, chain_id, fees):
+    """
+    Unsigned copy of a node's transaction (same nonce, recipient, data,
+    value and gas limit) with new fees.
+    """
+    out = {
+        "nonce": int(tx["nonce"], 16),
+        "gas": int(tx["gas"], 16),
+        "value": int(tx["value"], 16),
+        "data": tx["input"],
+        "chainId": chain_id,
+        **fees,
+    }
+    if tx.get("to"):
+        out["to"] = tx["to"]
+    if tx.get("accessList"):
+        out["accessList"] = tx["accessList"]
+    return out
+
+
+def _gwei(fees):
+    return (fees.get("maxFeePerGas") or fees["gasPrice"]) / 10**9
+
+
+class FeeBumper:
+    """
+    Watchdog for the receipt tracker: every transaction that has had no
+    receipt for `stuck_after` seconds is signed again with the same nonce and
+    bumped fees and sent as a replacement. The tracker then follows every
+    version, so whoever waits on the original hash gets the replacement's
+    receipt. Bumping stops at the fee ceiling (`ceiling` wei, else
+    CEILING_MULTIPLIER times the first fee).
+
+    signer(address) returns the private key for a sender or None, market(tx)
+    optional current fees to pay at least, on_replace(tx, new_hash, fees) is
+    called after every accepted replacement.
+    """
+
+    def __init__(self, tracker, signer, stuck_after=STUCK_AFTER, ceiling=None, market=None,
+                 on_replace=None, interval=CHECK_INTERVAL):
+        self.tracker = tracker
+        self.signer = signer
+        self.stuck_after = stuck_after
+        self.ceiling = ceiling
+        self.market = market
+        self.on_replace = on_replace
+        self.interval = interval
+        self._state = {}
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="fee-bumper", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.check()
+
+    def check(self):
+        """
+        Replace every stuck transaction once. Returns the number of
+        replacements sent.
+        """
+        sent = 0
+        with self._check_lock:
+            for tx in self.tracker.stuck(self.stuck_after):
+                with self._lock:
+                    state = self._state.setdefault(tx.hash, {"tx": tx, "ceiling": None, "done": False})
+                if state["done"]:
+                    continue
+                try:
+                    sent += self._bump(tx, state)
+                except Exception as e:
+                    print(f"[!] Fee bumper: {tx.hash}: {e}")
+            with self._lock:
+                self._state = {h: st for h, st in self._state.items() if st["tx"].status == "pending"}
+        return sent
+
+    def _bump(self, tx, state):
+        pool = get_pool(tx.rpc_url)
+        current = pool.call("eth_getTransactionByHash", [tx.hashes[-1]])
+        if current is None or current.get("blockNumber"):
+            return 0  # mined or dropped, the tracker takes it from here
+        nonce = int(current["nonce"], 16)
+        private_key = self.signer(current["from"])
+        if private_key is None:
+            print(f"[!] Nonce {nonce} of {current['from']} is stuck, but its key is not loaded")
+            state["done"] = True
+            return 0
+
+        fees = fees_of(current)
+        if state["ceiling"] is None:
+            state["ceiling"] = self.ceiling or int(max(fees.values()) * CEILING_MULTIPLIER)
+        new_fees = bump_fees(fees, state["ceiling"], self.market(tx) if self.market else None)
+        if new_fees is None:
+            print(f"[!] Nonce {nonce} of {current['from']} still pending at {_gwei(fees):.2f} gwei, "
+                  f"the fee ceiling ({state['ceiling'] / 10**9:.2f} gwei) allows no further replacement")
+            state["done"] = True
+            return 0
+
+        from eth_account import Account
+        chain_id = tx.meta.get("chain_id") or int(current["chainId"], 16)
+        signed = Account.sign_transaction(replacement_tx(current, chain_id, new_fees), private_key)
+        new_hash = "0x" + bytes(signed.hash).hex()
+        try:
+            pool.call("eth_sendRawTransaction", ["0x" + bytes(signed.rawTransaction).hex()])
+        except RPCError as e:
+            message = e.message.lower()
+            if "nonce too low" in message:
+                return 0  # one of the versions was just mined
+            if "already known" not in message:
+                raise
+        self.tracker.replace(tx.hash, new_hash)
+        print(f"[+] Nonce {nonce} stuck for {time.time() - tx.submitted_at:.0f}s, replaced by {new_hash} "
+              f"at {_gwei(new_fees):.2f} gwei (replacement {len(tx.hashes) - 1})")
+        if self.on_replace:
+            self.on_replace(tx, new_hash, new_fees)
+        return 1
+
+    def gave_up(self, tx):
+        """
+        True once tx hit the fee ceiling or its key is unknown.
+        """
+        with self._lock:
+            state = self._state.get(tx.hash)
+        return bool(state and state["done"])
+
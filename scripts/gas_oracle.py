@@ -0,0 +1,112 @@
+import time
+import threading
+from statistics import median
+
+# Speed profiles: which tip percentile of recent blocks to pay, and how much
+# base fee growth maxFeePerGas should absorb before the transaction stalls.
+PROFILES = {
+    "economy": {"percentile": 10, "base_multiplier": 1.25, "legacy_multiplier": 1.0},
+    "normal": {"percentile": 50, "base_multiplier": 2.0, "legacy_multiplier": 1.1},
+    "urgent": {"percentile": 90, "base_multiplier": 3.0, "legacy_multiplier": 1.3},
+}
+PERCENTILES = sorted(p["percentile"] for p in PROFILES.values())
+
+MIN_PRIORITY_FEE = 1_000_000  # 0.001 gwei, some testnets report zero tips
+# Added on top of the margin: the cached estimate may come from a call that
+# did not have to create a new storage slot (e.g. a recipient that already
+# held tokens), which costs ~20k more gas.
+GAS_HEADROOM = 25_000
+
+
+class GasOracle:
+    """
+    Per-chain fee and gas-limit source.
+
+    Fees come from one eth_feeHistory call per chain, cached for `ttl`
+    seconds; every profile is derived from the same history. Chains without
+    EIP-1559 fall back to eth_gasPrice. Gas limits come from eth_estimateGas,
+    cached per (chain, contract, selector) for `gas_ttl` seconds, and include
+    a safety margin.
+    """
+
+    def __init__(self, ttl=12, gas_ttl=300, history_blocks=20, margin=1.2):
+        self.ttl = ttl
+        self.gas_ttl = gas_ttl
+        self.history_blocks = history_blocks
+        self.margin = margin
+        self._fees = {}
+        self._gas = {}
+        self._lock = threading.Lock()
+
+    def fees(self, w3, chain_id, profile="normal"):
+        """
+        Return the fee fields for a transaction on chain_id:
+        {"maxFeePerGas", "maxPriorityFeePerGas"} or {"gasPrice"} on legacy chains.
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown gas profile '{profile}', expected one of {', '.join(PROFILES)}")
+        now = time.monotonic()
+        with self._lock:
+            cached = self._fees.get(chain_id)
+        if cached is None or now - cached[0] > self.ttl:
+            cached = (now, self._sample(w3))
+            with self._lock:
+                self._fees[chain_id] = cached
+        sample = cached[1]
+        settings = PROFILES[profile]
+
+        if sample["base_fee"] is None:
+            return {"gasPrice": int(sample["gas_price"] * settings["legacy_multiplier"])}
+        tip = max(sample["tips"][settings["percentile"]], MIN_PRIORITY_FEE)
+        return {
+            "maxFeePerGas": int(sample["base_fee"] * settings["base_multiplier"]) + tip,
+            "maxPriorityFeePerGas": tip,
+        }
+
+    def _sample(self, w3):
+        try:
+            history = w3.eth.fee_history(self.history_blocks, "latest", PERCENTILES)
+            base_fee = history["baseFeePerGas"][-1]
+            rewards = history.get("reward") or []
+        except Exception:
+            base_fee, rewards = None, []
+        if not base_fee:
+            return {"base_fee": None, "gas_price": w3.eth.gas_price}
+        tips = {}
+        for i, pct in enumerate(PERCENTILES):
+            column = [r[i] for r in rewards if len(r) > i]
+            tips[pct] = int(median(column)) if column else 0
+        return {"base_fee": base_fee, "tips": tips}
+
+    def estimate_gas(self, w3, chain_id, tx):
+        """
+        Gas limit for tx, from the per (chain, contract, selector) cache when possible.
+        """
+        data = tx.get("data") or b""
+        if isinstance(data, str):
+            data = bytes.fromhex(data[2:] if data.startswith("0x") else data)
+        key = (chain_id, (tx.get("to") or "").lower(), data[:4])
+        now = time.monotonic()
+        with self._lock:
+            cached = self._gas.get(key)
+        if cached and now - cached[0] <= self.gas_ttl:
+            return cached[1]
+        call = {k: tx[k] for k in ("from", "to", "data", "value") if k in tx}
+        limit = int(w3.eth.estimate_gas(call) * self.margin) + GAS_HEADROOM
+        with self._lock:
+            previous = self._gas.get(key)
+            if previous and now - previous[0] <= self.gas_ttl:
+                limit = max(limit, previous[1])
+            self._gas[key] = (now, limit)
+        return limit
+
+    def prepare(self, w3, chain_id, tx, sender, profile="normal"):
+        """
+        Return a copy of tx with any missing gas limit and fee fields filled in.
+        """
+        tx = dict(tx)
+        if "gas" not in tx:
+            tx["gas"] = self.estimate_gas(w3, chain_id, dict(tx, **{"from": sender}))
+        if not any(k in tx for k in ("gasPrice", "maxFeePerGas")):
+            tx.update(self.fees(w3, chain_id, profile))
+        return tx
@@ -20,16 +20,21 @@ ascii_art = r"""
    
 """
 
-def gay(text):
+def gay(text, delay=0.002):
+    if not delay:
+        colored = "".join(letter if letter == " " else colors[i % len(colors)] + letter for i, letter in enumerate(text))
+        print(colored + END)
+        return
     for i, letter in enumerate(text):
         if letter != " ":
             print(colors[i % len(colors)] + letter, end="", flush=True)
         else:
             print(letter, end="", flush=True)
-        time.sleep(0.002)
+        time.sleep(delay)
     print(END)
 
-def banner():
-    gay(ascii_art)
+def banner(instant=False, quiet=False):
+    if quiet:
+        return
+    gay(ascii_art, delay=0 if instant else 0.002)
     print(GREEN + "WELCOME" + END)
-    
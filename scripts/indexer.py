@@ -0,0 +1,195 @@
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rpc import get_pool, RPCError
+from metrics import labels
+
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+ZERO_ADDRESS = "0x" + "0" * 40
+MAX_RANGE = 10000       # blocks per eth_getLogs once a provider allows it
+START_RANGE = 2000
+ADDRESS_CHUNK = 500     # token addresses per eth_getLogs filter
+REORG_LAG = 3           # blocks behind the head that are left for the next run
+COMMIT_EVERY = 50000    # blocks scanned between checkpoint writes
+
+# Provider messages that mean "ask for a smaller block range". Wording differs
+# per client and vendor (geth, erigon, Alchemy, Infura, QuickNode, ...).
+RANGE_ERRORS = re.compile(
+    r"too many|more than \d+ results|limit exceeded|range|response size|query timeout|"
+    r"exceed|max results|10000 results|log response size",
+    re.IGNORECASE,
+)
+SUGGESTED_RANGE = re.compile(r"\[(0x[0-9a-f]+),\s*(0x[0-9a-f]+)\]", re.IGNORECASE)
+
+
+def _is_range_error(error):
+    return isinstance(error, RPCError) and bool(RANGE_ERRORS.search(error.message))
+
+
+def scan_logs(pool, addresses, from_block, to_block, max_range=MAX_RANGE):
+    """
+    Yield (last block, Transfer logs) for consecutive ranges from from_block
+    to to_block. The range shrinks by half whenever the provider rejects it
+    as too large (or to the range it suggests) and grows back after each
+    success, so one run adapts to whatever limit the endpoint has.
+    """
+    start, size = from_block, min(START_RANGE, max_range)
+    while start <= to_block:
+        end = min(start + size - 1, to_block)
+        try:
+            logs = pool.call("eth_getLogs", [{
+                "address": addresses,
+                "fromBlock": hex(start),
+                "toBlock": hex(end),
+                "topics": [TRANSFER_TOPIC],
+            }])
+        except RPCError as e:
+            if not _is_range_error(e) or end == start:
+                raise
+            suggested = SUGGESTED_RANGE.search(e.message)
+            if suggested and int(suggested.group(1), 16) == start and int(suggested.group(2), 16) < end:
+                size = int(suggested.group(2), 16) - start + 1
+            else:
+                size = max(1, (end - start + 1) // 2)
+            continue
+        yield end, logs or []
+        start = end + 1
+        size = min(size * 2, max_range)
+
+
+def transfer_deltas(logs, deltas=None):
+    """
+    Turn Transfer logs into {(token, holder): signed amount}, adding to
+    `deltas` when given. Mints and burns only touch the non-zero side.
+    """
+    deltas = defaultdict(int) if deltas is None else deltas
+    for log in logs:
+        topics = log.get("topics") or []
+        if len(topics) != 3 or log.get("removed"):
+            continue  # not an ERC20 Transfer (ERC721 has 4 topics)
+        token = log["address"].lower()
+        sender = "0x" + topics[1][-40:]
+        recipient = "0x" + topics[2][-40:]
+        value = int(log["data"], 16) if log.get("data") not in (None, "0x") else 0
+        if sender != ZERO_ADDRESS:
+            deltas[(token, sender)] -= value
+        if recipient != ZERO_ADDRESS:
+            deltas[(token, recipient)] += value
+    return deltas
+
+
+def find_deployment_block(pool, address, head):
+    """
+    Binary search the first block where address has code. Needs an endpoint
+    that serves historical state; returns 0 when it does not.
+    """
+    low, high = 0, head
+    try:
+        while low < high:
+            mid = (low + high) // 2
+            if pool.call("eth_getCode", [address, hex(mid)]) not in (None, "0x"):
+                high = mid
+            else:
+                low = mid + 1
+    except RPCError:
+        return 0
+    return low
+
+
+class ChainIndexer:
+    """
+    Indexes the Transfer logs of every registered token on one chain into the
+    registry's holders table.
+
+    The chain has one checkpoint: the last block whose logs are stored. Tokens
+    that are not indexed yet are first backfilled from their deployment block
+    up to that checkpoint, then all tokens are scanned together from the
+    checkpoint to the head, ADDRESS_CHUNK addresses per filter. Balances and
+    the checkpoint are written together every COMMIT_EVERY blocks; a backfill
+    is written together with the token's indexed mark. Either way an
+    interrupted run never leaves balances that the next run counts again.
+    """
+
+    def __init__(self, registry, chain, rpc_url, max_range=MAX_RANGE, lag=REORG_LAG):
+        self.registry = registry
+        self.chain = chain
+        self.pool = get_pool(rpc_url)
+        self.max_range = max_range
+        self.lag = lag
+
+    def _scan(self, addresses, from_block, to_block, checkpoint, mark_tokens=()):
+        count = 0
+        backfill = defaultdict(int)
+        for start in range(from_block, to_block + 1, COMMIT_EVERY):
+            end = min(start + COMMIT_EVERY - 1, to_block)
+            deltas = backfill if not checkpoint else defaultdict(int)
+            for i in range(0, len(addresses), ADDRESS_CHUNK):
+                for _, logs in scan_logs(self.pool, addresses[i:i + ADDRESS_CHUNK], start, end, self.max_range):
+                    transfer_deltas(logs, deltas)
+                    count += len(logs)
+            if checkpoint:
+                self.registry.apply_transfers(self.chain, deltas, end)
+        if not checkpoint:
+            self.registry.apply_transfers(self.chain, backfill, None, mark_tokens)
+        return count
+
+    def run(self, deployments):
+        head = int(self.pool.call("eth_blockNumber"), 16) - self.lag
+        last_block, indexed = self.registry.index_checkpoint(self.chain)
+        stats = {"chain": self.chain, "tokens": len(deployments), "logs": 0, "from": None, "to": head}
+
+        new = [d for d in deployments if d["address"].lower() not in indexed]
+        if last_block is None:
+            # First run on this chain: everything starts at the oldest deployment.
+            starts = [self._start_block(d, head) for d in new]
+            first = min(starts) if starts else head
+            if first > head:
+                return stats
+            self.registry.apply_transfers(self.chain, {}, first - 1, [d["address"] for d in new])
+            last_block = first - 1
+        else:
+            for d in new:
+                start = self._start_block(d, head)
+                if start <= last_block:
+                    stats["logs"] += self._scan([d["address"]], start, last_block, False, [d["address"]])
+                else:
+                    self.registry.apply_transfers(self.chain, {}, None, [d["address"]])
+
+        if last_block >= head:
+            return stats
+        stats["from"] = last_block + 1
+        addresses = sorted({d["address"] for d in deployments})
+        stats["logs"] += self._scan(addresses, last_block + 1, head, True)
+        return stats
+
+    def _start_block(self, deployment, head):
+        if deployment.get("block_number"):
+            return deployment["block_number"]
+        block = find_deployment_block(self.pool, deployment["address"], head)
+        if block:
+            self.registry.set_block_number(self.chain, deployment["address"], block)
+        return block
+
+
+def index_chains(registry, targets, max_workers=None, max_range=MAX_RANGE):
+    """
+    targets: {chain name: (rpc_url, [deployment dicts])}. Every chain is
+    indexed at the same time. Returns {chain name: stats dict or {"error"}}.
+    """
+    def run(name, rpc_url, deployments):
+        with labels(chain=name):
+            return ChainIndexer(registry, name, rpc_url, max_range).run(deployments)
+
+    out = {}
+    if not targets:
+        return out
+    with ThreadPoolExecutor(max_workers=max_workers or len(targets)) as pool:
+        futures = {pool.submit(run, name, url, deps): name for name, (url, deps) in targets.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                out[name] = future.result()
+            except Exception as e:
+                out[name] = {"chain": name, "error": str(e)}
+    return out
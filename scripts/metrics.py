@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import itertools
+import functools
+import threading
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the Prometheus histogram buckets; forge builds and
+# verifications land in the top ones, single RPC calls in the bottom ones.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+METRIC_NAME = "deploy_phase_seconds"
+WRITE_EVERY = 15  # seconds between rewrites of the Prometheus file during a run
+
+_context = threading.local()
+_span_ids = itertools.count(1)
+
+
+def current_labels():
+    return dict(getattr(_context, "labels", {}))
+
+
+def set_labels(**values):
+    """
+    Set labels (chain, key, ...) for every later span on this thread.
+    None values are ignored.
+    """
+    _context.labels = {**current_labels(), **{k: v for k, v in values.items() if v is not None}}
+
+
+@contextmanager
+def labels(**values):
+    """
+    Like set_labels, but only for the duration of the with block.
+    """
+    previous = current_labels()
+    set_labels(**values)
+    try:
+        yield
+    finally:
+        _context.labels = previous
+
+
+def bind(fn):
+    """
+    Wrap fn so it runs with the calling thread's labels, for work handed to a
+    thread pool.
+    """
+    captured = current_labels()
+
+    def run(*args, **kwargs):
+        with labels(**captured):
+            return fn(*args, **kwargs)
+    return run
+
+
+class Span:
+    """
+    One timed phase. Set `outcome` to something other than "ok" (for example
+    "failed" or "cached") to record how it ended; an exception sets "error".
+    """
+
+    def __init__(self, name, fields):
+        self.id = next(_span_ids)
+        self.name = name
+        self.fields = fields
+        self.outcome = "ok"
+        self.error = None
+        self.parent = getattr(_context, "span", None)
+        self.started_at = time.time()
+
+
+class Metrics:
+    """
+    Collects finished spans. Every span is appended to the JSONL trace file
+    (if one is open) as soon as it ends, and counted in a per-series histogram
+    that write_prometheus() dumps in the Prometheus text format, e.g. for the
+    node exporter's textfile collector.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._trace = None
+        self.prometheus_path = None
+        self._last_write = 0.0
+
+    @property
+    def enabled(self):
+        return self._trace is not None or self.prometheus_path is not None
+
+    def configure(self, trace_path=None, prometheus_path=None):
+        with self._lock:
+            if trace_path:
+                self._trace = open(trace_path, "a")
+            self.prometheus_path = prometheus_path or self.prometheus_path
+
+    def record(self, span, seconds):
+        if not self.enabled:
+            return
+        labels = {"phase": span.name, **span.fields, "outcome": span.outcome}
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"count": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS)}
+            series["count"] += 1
+            series["sum"] += seconds
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    series["buckets"][i] += 1
+            if self._trace:
+                self._trace.write(json.dumps({
+                    "span": span.name, "id": span.id, "parent": span.parent, "start": round(span.started_at, 6),
+                    "seconds": round(seconds, 6), "outcome": span.outcome, "error": span.error,
+                    "thread": threading.current_thread().name, **span.fields,
+                }) + "\n")
+                self._trace.flush()
+            due = self.prometheus_path and time.monotonic() - self._last_write >= WRITE_EVERY
+        if due:
+            self.write_prometheus()
+
+    def write_prometheus(self, path=None):
+        """
+        Write every series as a histogram. The file is replaced atomically so
+        a scraper never reads half of it.
+        """
+        path = path or self.prometheus_path
+        if not path:
+            return
+        lines = [f"# HELP {METRIC_NAME} Time spent per deploy bot phase.", f"# TYPE {METRIC_NAME} histogram"]
+        with self._lock:
+            self._last_write = time.monotonic()
+            for key, series in sorted(self._series.items()):
+                base = ",".join(f'{name}="{_escape(value)}"' for name, value in key)
+                for bound, count in zip(BUCKETS, series["buckets"]):
+                    lines.append(f'{METRIC_NAME}_bucket{{{base},le="{bound}"}} {count}')
+                lines.append(f'{METRIC_NAME}_bucket{{{base},le="+Inf"}} {series["count"]}')
+                lines.append(f"{METRIC_NAME}_sum{{{base}}} {series['sum']:.6f}")
+                lines.append(f"{METRIC_NAME}_count{{{base}}} {series['count']}")
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+
+    def close(self):
+        self.write_prometheus()
+        with self._lock:
+            if self._trace:
+                self._trace.close()
+                self._trace = None
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = Metrics()
+
+
+@contextmanager
+def span(name, **fields):
+    """
+    Time the with block as phase `name`, labelled with the thread's labels
+    plus `fields`. Yields the Span so the block can set its outcome.
+    """
+    s = Span(name, {**current_labels(), **{k: v for k, v in fields.items() if v is not None}})
+    _context.span = s.id
+    started = time.perf_counter()
+    try:
+        yield s
+    except BaseException as e:
+        s.outcome, s.error = "error", str(e)
+        raise
+    finally:
+        _context.span = s.parent
+        METRICS.record(s, time.perf_counter() - started)
+
+
+def traced(name):
+    """
+    Decorator form of span() for functions that return None (or False) on
+    failure.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with span(name) as s:
+                result = fn(*args, **kwargs)
+                if not result:
+                    s.outcome = "failed"
+                return result
+        return run
+    return decorate
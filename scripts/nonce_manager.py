@@ -0,0 +1,131 @@
+import heapq
+import threading
+
+
+class NonceLane:
+    """
+    Local nonce state for one (chain, address) pair.
+    """
+
+    def __init__(self):
+        self.next_nonce = None   # fetched from the node on first use
+        self.gaps = []           # heap of nonces to hand out again before next_nonce
+        self.in_flight = set()   # allocated but not yet accepted or rejected
+        self.sent = {}           # nonce -> hashes the node accepted for it, above the node's pending count
+        self.lock = threading.Lock()
+
+
+class NonceManager:
+    """
+    Hands out nonces per (chain_id, address) without an RPC round trip per
+    transaction. The pending nonce is fetched once per lane and nonces are
+    then allocated locally, so several transactions can be in flight at once.
+
+    release() returns the nonce of a rejected transaction so it is reused
+    before any new one, and resync() realigns a lane with the node's pending
+    nonce, turning dropped nonces into gaps that the next allocations fill.
+    A nonce only counts as dropped when the node no longer knows any
+    transaction confirm() recorded for it, so transactions queued behind a
+    dropped one are never sent again.
+    """
+
+    def __init__(self):
+        self._lanes = {}
+        self._lock = threading.Lock()
+
+    def _lane(self, chain_id, address):
+        key = (int(chain_id), address.lower())
+        with self._lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = self._lanes[key] = NonceLane()
+        return lane
+
+    def allocate(self, w3, chain_id, address):
+        """
+        Return the next nonce to use for address on chain_id.
+        """
+        lane = self._lane(chain_id, address)
+        with lane.lock:
+            if lane.next_nonce is None:
+                lane.next_nonce = w3.eth.get_transaction_count(address, "pending")
+            if lane.gaps:
+                nonce = heapq.heappop(lane.gaps)
+            else:
+                nonce = lane.next_nonce
+                lane.next_nonce += 1
+            lane.in_flight.add(nonce)
+            return nonce
+
+    def confirm(self, chain_id, address, nonce, tx_hash=None):
+        """
+        The node accepted the transaction using nonce (tx_hash, when known;
+        a replacement of the same nonce is confirmed with its own hash).
+        """
+        lane = self._lane(chain_id, address)
+        with lane.lock:
+            lane.in_flight.discard(nonce)
+            if tx_hash is not None:
+                lane.sent.setdefault(nonce, []).append(tx_hash)
+
+    def release(self, chain_id, address, nonce):
+        """
+        The node rejected the transaction using nonce, so it can be reused.
+        """
+        lane = self._lane(chain_id, address)
+        with lane.lock:
+            lane.in_flight.discard(nonce)
+            if lane.next_nonce is None or nonce in lane.gaps:
+                return
+            heapq.heappush(lane.gaps, nonce)
+            self._collapse(lane)
+
+    def resync(self, w3, chain_id, address):
+        """
+        Re-read the pending nonce from the node. Nonces between it and our
+        local counter that are not currently being sent, and whose
+        transactions the node does not know (dropped or never delivered),
+        become gaps. Accepted transactions queued behind a dropped nonce keep
+        theirs. Returns the sorted gap list.
+        """
+        lane = self._lane(chain_id, address)
+        with lane.lock:
+            pending = w3.eth.get_transaction_count(address, "pending")
+            lane.sent = {n: hashes for n, hashes in lane.sent.items() if n >= pending}
+            if lane.next_nonce is None or pending >= lane.next_nonce:
+                lane.next_nonce = pending
+                lane.gaps = []
+            else:
+                lane.gaps = sorted(n for n in range(pending, lane.next_nonce)
+                                   if n not in lane.in_flight and not self._known(w3, lane.sent.get(n, ())))
+                self._collapse(lane)
+            return sorted(lane.gaps)
+
+    def gaps(self, chain_id, address):
+        lane = self._lane(chain_id, address)
+        with lane.lock:
+            return sorted(lane.gaps)
+
+    @staticmethod
+    def _known(w3, hashes):
+        from web3.exceptions import TransactionNotFound
+        for tx_hash in hashes:
+            try:
+                w3.eth.get_transaction(tx_hash)
+                return True
+            except TransactionNotFound:
+                continue
+            except Exception:
+                return True  # unsure; never reuse a nonce that may still be queued
+        return False
+
+    @staticmethod
+    def _collapse(lane):
+        # Gaps at the top of the range are simply not handed out yet.
+        while lane.gaps:
+            top = max(lane.gaps)
+            if top != lane.next_nonce - 1 or top in lane.in_flight:
+                break
+            lane.gaps.remove(top)
+            lane.next_nonce -= 1
+        heapq.heapify(lane.gaps)
@@ -0,0 +1,335 @@
+import os
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deployments (
+    id           INTEGER PRIMARY KEY,
+    chain        TEXT NOT NULL,
+    token_name   TEXT NOT NULL,
+    address      TEXT NOT NULL COLLATE NOCASE,
+    status       TEXT NOT NULL DEFAULT 'unverified',
+    deployer     TEXT NOT NULL COLLATE NOCASE,
+    block_number INTEGER,
+    created_at   REAL NOT NULL,
+    UNIQUE (chain, address)
+);
+CREATE INDEX IF NOT EXISTS idx_deployments_chain_deployer ON deployments (chain, deployer);
+CREATE INDEX IF NOT EXISTS idx_deployments_deployer ON deployments (deployer);
+CREATE INDEX IF NOT EXISTS idx_deployments_address ON deployments (address);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    hash          TEXT PRIMARY KEY COLLATE NOCASE,
+    chain_id      INTEGER NOT NULL,
+    sender        TEXT COLLATE NOCASE,
+    kind          TEXT,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    block_number  INTEGER,
+    gas_used      INTEGER,
+    confirmations INTEGER,
+    submitted_at  REAL NOT NULL,
+    finalized_at  REAL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_status ON transactions (status);
+
+CREATE TABLE IF NOT EXISTS verify_jobs (
+    id              INTEGER PRIMARY KEY,
+    chain           TEXT NOT NULL,
+    token_name      TEXT NOT NULL,
+    address         TEXT NOT NULL COLLATE NOCASE,
+    deployer        TEXT NOT NULL COLLATE NOCASE,
+    verifier        TEXT NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'queued',
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error      TEXT,
+    updated_at      REAL NOT NULL,
+    UNIQUE (chain, address)
+);
+CREATE INDEX IF NOT EXISTS idx_verify_jobs_due ON verify_jobs (verifier, status, next_attempt_at);
+
+-- Token balances rebuilt from Transfer logs. Balances are uint256, so they
+-- are stored as decimal TEXT; zero balances are deleted.
+CREATE TABLE IF NOT EXISTS holders (
+    chain   TEXT NOT NULL,
+    token   TEXT NOT NULL COLLATE NOCASE,
+    holder  TEXT NOT NULL COLLATE NOCASE,
+    balance TEXT NOT NULL,
+    PRIMARY KEY (chain, token, holder)
+) WITHOUT ROWID;
+
+-- Last block whose Transfer logs are in holders, per chain, and the tokens
+-- that are indexed up to it.
+CREATE TABLE IF NOT EXISTS index_checkpoints (
+    chain      TEXT PRIMARY KEY,
+    last_block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS indexed_tokens (
+    chain TEXT NOT NULL,
+    token TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (chain, token)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class Registry:
+    """
+    Deployment registry in an SQLite database (WAL mode).
+
+    Every thread gets its own connection; writes run in BEGIN IMMEDIATE
+    transactions with a busy timeout, so several threads or processes can
+    record deployments at the same time without corrupting anything.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def add_deployment(self, chain, token_name, address, deployer, status="unverified", block_number=None):
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO deployments (chain, token_name, address, status, deployer, block_number, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (chain, address) DO NOTHING",
+                (chain, token_name, address, status, deployer, block_number, time.time()),
+            )
+
+    def list_deployments(self, chain, deployer):
+        """
+        Return [(token_name, address, status)] for one chain and deployer, oldest first.
+        """
+        rows = self._conn().execute(
+            "SELECT token_name, address, status FROM deployments WHERE chain = ? AND deployer = ? ORDER BY id",
+            (chain, deployer),
+        )
+        return rows.fetchall()
+
+    def all_deployments(self, chain=None, deployer=None):
+        """
+        Return every deployment as a dict, optionally filtered by chain and/or deployer.
+        """
+        query = "SELECT id, chain, token_name, address, status, deployer, block_number, created_at FROM deployments"
+        clauses, params = [], []
+        if chain:
+            clauses.append("chain = ?")
+            params.append(chain)
+        if deployer:
+            clauses.append("deployer = ?")
+            params.append(deployer)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        cursor = self._conn().execute(query + " ORDER BY id", params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def set_status(self, chain, token_name, address, deployer, status):
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE deployments SET status = ? WHERE chain = ? AND token_name = ? AND address = ? AND deployer = ?",
+                (status, chain, token_name, address, deployer),
+            )
+
+    def set_block_number(self, chain, address, block_number):
+        with self._write() as conn:
+            conn.execute("UPDATE deployments SET block_number = ? WHERE chain = ? AND address = ?",
+                         (block_number, chain, address))
+
+    def add_transaction(self, tx_hash, chain_id, sender=None, kind=None, submitted_at=None):
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO transactions (hash, chain_id, sender, kind, submitted_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (hash) DO NOTHING",
+                (tx_hash, chain_id, sender, kind, submitted_at or time.time()),
+            )
+
+    def finish_transaction(self, tx_hash, status, block_number=None, gas_used=None, confirmations=None):
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE transactions SET status = ?, block_number = ?, gas_used = ?, confirmations = ?, finalized_at = ? "
+                "WHERE hash = ?",
+                (status, block_number, gas_used, confirmations, time.time(), tx_hash),
+            )
+
+    def transactions(self, status=None):
+        query = "SELECT * FROM transactions"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        cursor = self._conn().execute(query + " ORDER BY submitted_at", params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def enqueue_verification(self, chain, token_name, address, deployer, verifier, delay=0):
+        """
+        Queue a contract for verification. Re-queuing a contract that is not
+        verified yet resets its attempts; a verified one is left alone.
+        """
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO verify_jobs (chain, token_name, address, deployer, verifier, next_attempt_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (chain, address) DO UPDATE SET status = 'queued', attempts = 0, "
+                "next_attempt_at = excluded.next_attempt_at, updated_at = excluded.updated_at "
+                "WHERE verify_jobs.status != 'done'",
+                (chain, token_name, address, deployer, verifier, now + delay, now),
+            )
+
+    def claim_verification(self, verifier):
+        """
+        Atomically take the oldest due queued job for verifier and mark it
+        running. Returns the job as a dict, or None if nothing is due.
+        """
+        now = time.time()
+        with self._write() as conn:
+            cursor = conn.execute(
+                "SELECT * FROM verify_jobs WHERE verifier = ? AND status = 'queued' AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT 1",
+                (verifier, now),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            job = dict(zip([c[0] for c in cursor.description], row))
+            conn.execute("UPDATE verify_jobs SET status = 'running', updated_at = ? WHERE id = ?", (now, job["id"]))
+        return job
+
+    def finish_verification(self, job_id, status, attempts, next_attempt_at=None, error=None):
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE verify_jobs SET status = ?, attempts = ?, next_attempt_at = COALESCE(?, next_attempt_at), "
+                "last_error = ?, updated_at = ? WHERE id = ?",
+                (status, attempts, next_attempt_at, error, now, job_id),
+            )
+
+    def requeue_running_verifications(self, stale_after=3600):
+        """
+        Put jobs left 'running' for longer than stale_after seconds (by a
+        process that died) back in the queue.
+        """
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE verify_jobs SET status = 'queued' WHERE status = 'running' AND updated_at < ?",
+                (time.time() - stale_after,),
+            )
+
+    def verification_counts(self):
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM verify_jobs GROUP BY status")
+        return dict(rows.fetchall())
+
+    def next_verification_due(self, verifiers):
+        marks = ",".join("?" * len(verifiers))
+        row = self._conn().execute(
+            f"SELECT MIN(next_attempt_at) FROM verify_jobs WHERE status = 'queued' AND verifier IN ({marks})",
+            list(verifiers),
+        ).fetchone()
+        return row[0]
+
+    def index_checkpoint(self, chain):
+        """
+        Return (last indexed block or None, set of indexed token addresses, lowercase).
+        """
+        conn = self._conn()
+        row = conn.execute("SELECT last_block FROM index_checkpoints WHERE chain = ?", (chain,)).fetchone()
+        tokens = {t.lower() for (t,) in conn.execute("SELECT token FROM indexed_tokens WHERE chain = ?", (chain,))}
+        return (row[0] if row else None), tokens
+
+    def apply_transfers(self, chain, deltas, last_block=None, tokens=()):
+        """
+        Add {(token, holder): signed amount} to the stored balances, mark
+        `tokens` as indexed and move the chain checkpoint to last_block, all in
+        one transaction, so a crash never counts a block twice.
+        """
+        with self._write() as conn:
+            for (token, holder), delta in deltas.items():
+                if not delta:
+                    continue
+                row = conn.execute("SELECT balance FROM holders WHERE chain = ? AND token = ? AND holder = ?",
+                                   (chain, token, holder)).fetchone()
+                balance = (int(row[0]) if row else 0) + delta
+                if balance:
+                    conn.execute("INSERT INTO holders (chain, token, holder, balance) VALUES (?, ?, ?, ?) "
+                                 "ON CONFLICT (chain, token, holder) DO UPDATE SET balance = excluded.balance",
+                                 (chain, token, holder, str(balance)))
+                else:
+                    conn.execute("DELETE FROM holders WHERE chain = ? AND token = ? AND holder = ?", (chain, token, holder))
+            conn.executemany("INSERT INTO indexed_tokens (chain, token) VALUES (?, ?) ON CONFLICT DO NOTHING",
+                             [(chain, t) for t in tokens])
+            if last_block is not None:
+                conn.execute("INSERT INTO index_checkpoints (chain, last_block) VALUES (?, ?) "
+                             "ON CONFLICT (chain) DO UPDATE SET last_block = excluded.last_block",
+                             (chain, last_block))
+
+    def holders(self, chain, token, limit=None):
+        """
+        Return [(holder, balance as int)] for a token, largest balance first.
+        """
+        # Decimal strings without leading zeros sort numerically by (length, text).
+        query = ("SELECT holder, balance FROM holders WHERE chain = ? AND token = ? "
+                 "ORDER BY length(balance) DESC, balance DESC")
+        params = [chain, token]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [(holder, int(balance)) for holder, balance in self._conn().execute(query, params)]
+
+    def holder_count(self, chain, token):
+        row = self._conn().execute("SELECT COUNT(*) FROM holders WHERE chain = ? AND token = ?", (chain, token)).fetchone()
+        return row[0]
+
+    def import_flat_file(self, path):
+        """
+        One-time import of the old contract_info.txt format
+        (chain,token,address,status,deployer per line). Returns the number of
+        rows imported, 0 if the file was already imported or does not exist.
+        """
+        if not os.path.exists(path):
+            return 0
+        key = "imported:" + os.path.abspath(path)
+        with self._write() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return 0
+            count = 0
+            with open(path, "r") as f:
+                for line in f:
+                    parts = line.strip().split(",")
+                    if len(parts) != 5:
+                        continue
+                    chain, token_name, address, status, deployer = parts
+                    cursor = conn.execute(
+                        "INSERT INTO deployments (chain, token_name, address, status, deployer, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (chain, address) DO NOTHING",
+                        (chain, token_name, address, status, deployer, time.time()),
+                    )
+                    count += cursor.rowcount
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(time.time())))
+        return count
@@ -0,0 +1,385 @@
+import json
+import time
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from eth_utils import keccak
+from web3.providers.base import JSONBaseProvider
+
+from metrics import span
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_TIMEOUT = 30
+
+# Reads that are safe to send to a second endpoint while the first is slow.
+IDEMPOTENT_METHODS = {
+    "eth_chainId", "eth_blockNumber", "eth_getBalance", "eth_getCode",
+    "eth_call", "eth_estimateGas", "eth_gasPrice", "eth_maxPriorityFeePerGas", "eth_feeHistory",
+    "eth_getBlockByNumber", "eth_getBlockByHash", "eth_getTransactionByHash",
+    "eth_getTransactionReceipt", "eth_getLogs", "net_version", "web3_clientVersion",
+}
+HEDGE_AFTER = 0.75      # seconds before a read is also sent to the next best endpoint
+LATENCY_ALPHA = 0.3     # EWMA weight of the newest latency / error sample
+COOLDOWN = 30           # seconds an endpoint is skipped after consecutive failures
+
+
+class RPCError(ValueError):
+    """
+    A JSON-RPC error response. Subclasses ValueError like web3's own errors.
+    """
+
+    def __init__(self, error):
+        super().__init__(error)
+        self.code = error.get("code") if isinstance(error, dict) else None
+        self.message = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+
+
+class RpcTransport:
+    """
+    One keep-alive HTTP connection pool per RPC endpoint, with JSON-RPC batch
+    support and per-endpoint request counters.
+    """
+
+    def __init__(self, url, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0}
+
+    def post(self, body, calls=1):
+        """
+        POST an encoded JSON-RPC payload and return the decoded response.
+        """
+        started = time.perf_counter()
+        failed = False
+        try:
+            response = self.session.post(self.url, data=body, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.stats["requests"] += 1
+                self.stats["calls"] += calls
+                self.stats["errors"] += failed
+                self.stats["seconds"] += elapsed
+                self.stats["max_seconds"] = max(self.stats["max_seconds"], elapsed)
+
+    def _payload(self, method, params):
+        return {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": list(params)}
+
+    def call(self, method, params=()):
+        """
+        Send one call and return its result, raising RPCError on an error response.
+        """
+        response = self.post(json.dumps(self._payload(method, params)))
+        if "error" in response:
+            raise RPCError(response["error"])
+        return response.get("result")
+
+    def batch(self, calls):
+        """
+        Send [(method, params), ...] as a single JSON-RPC batch POST.
+        Returns results in the same order; failed entries are RPCError instances.
+        """
+        if not calls:
+            return []
+        payload = [self._payload(method, params) for method, params in calls]
+        response = self.post(json.dumps(payload), calls=len(payload))
+        if isinstance(response, dict):
+            # Some endpoints answer a whole batch with a single error object.
+            raise RPCError(response.get("error", response))
+        by_id = {item.get("id"): item for item in response}
+        results = []
+        for request in payload:
+            item = by_id.get(request["id"], {"error": {"code": -32603, "message": "missing batch response"}})
+            results.append(RPCError(item["error"]) if "error" in item else item.get("result"))
+        return results
+
+
+_TRANSPORTS = {}
+_TRANSPORTS_LOCK = threading.Lock()
+
+
+def get_transport(url):
+    """
+    Return the shared transport for url, creating it on first use.
+    """
+    with _TRANSPORTS_LOCK:
+        transport = _TRANSPORTS.get(url)
+        if transport is None:
+            transport = _TRANSPORTS[url] = RpcTransport(url)
+        return transport
+
+
+def split_urls(rpc_url):
+    """
+    A chain's RPC_URL may list several endpoints separated by commas.
+    """
+    return [u.strip() for u in rpc_url.split(",") if u.strip()]
+
+
+class Endpoint:
+    """
+    Health score of one endpoint: EWMA latency and error rate.
+    """
+
+    def __init__(self, url):
+        self.transport = get_transport(url)
+        self.url = url
+        self.latency = HEDGE_AFTER  # optimistic prior until measured
+        self.error_rate = 0.0
+        self.failures = 0
+        self.down_until = 0.0
+
+    def score(self):
+        penalty = 1e6 if time.monotonic() < self.down_until else 0.0
+        return self.latency * (1 + 10 * self.error_rate) + penalty
+
+    def record(self, seconds, ok):
+        self.latency += LATENCY_ALPHA * (seconds - self.latency)
+        self.error_rate += LATENCY_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+        self.failures = 0 if ok else self.failures + 1
+        if self.failures >= 3:
+            self.down_until = time.monotonic() + COOLDOWN
+
+
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="rpc-hedge")
+
+
+class EndpointPool:
+    """
+    Routes calls for one chain across all of its RPC endpoints.
+
+    Every call goes to the endpoint with the best latency / error score.
+    Idempotent reads are hedged: if the first endpoint has not answered
+    after HEDGE_AFTER seconds the call is also sent to the next one and the
+    first answer wins. Raw transaction sends are never hedged; on a transport
+    failure the next endpoint is first asked whether it already knows the
+    transaction hash and only resends when it does not. Pending nonce reads
+    depend on the endpoint's mempool, so they are not hedged and go first to
+    the endpoint that last accepted a raw transaction.
+    """
+
+    def __init__(self, rpc_url, hedge_after=HEDGE_AFTER):
+        self.rpc_url = rpc_url
+        self.hedge_after = hedge_after
+        self.endpoints = [Endpoint(u) for u in split_urls(rpc_url)]
+        self._lock = threading.Lock()
+        self._last_send = None
+
+    def ranked(self, pending_nonce=False):
+        with self._lock:
+            ranked = sorted(self.endpoints, key=Endpoint.score)
+            if pending_nonce and self._last_send in ranked:
+                ranked.remove(self._last_send)
+                ranked.insert(0, self._last_send)
+            return ranked
+
+    def best_url(self):
+        return self.ranked()[0].url
+
+    def _post(self, endpoint, body, calls=1):
+        started = time.perf_counter()
+        try:
+            response = endpoint.transport.post(body, calls)
+        except Exception:
+            with self._lock:
+                endpoint.record(time.perf_counter() - started, False)
+            raise
+        with self._lock:
+            endpoint.record(time.perf_counter() - started, True)
+        return response
+
+    def post(self, method, body, params=()):
+        """
+        Send an encoded single-call payload and return the decoded response.
+        """
+        ranked = self.ranked(pending_nonce=_pending_nonce(method, params))
+        with span("rpc", method=method) as s:
+            if method == "eth_sendRawTransaction":
+                response = self._send_raw(ranked, body, params)
+            elif method in IDEMPOTENT_METHODS and len(ranked) > 1:
+                response = self._hedged(ranked, body)
+            else:
+                response = self._failover(ranked, body)
+            if "error" in response:
+                s.outcome = "rpc_error"
+            return response
+
+    def batch(self, calls):
+        """
+        Like RpcTransport.batch, on the best endpoint with failover to the
+        next one when the request fails.
+        """
+        ranked = self.ranked(pending_nonce=any(_pending_nonce(m, p) for m, p in calls))
+        last_error = None
+        with span("rpc", method="batch"):
+            for endpoint in ranked:
+                started = time.perf_counter()
+                try:
+                    results = endpoint.transport.batch(calls)
+                except Exception as e:
+                    with self._lock:
+                        endpoint.record(time.perf_counter() - started, False)
+                    last_error = e
+                    continue
+                with self._lock:
+                    endpoint.record(time.perf_counter() - started, True)
+                return results
+            raise last_error
+
+    def call(self, method, params=()):
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": list(params)}
+        response = self.post(method, json.dumps(payload), params)
+        if "error" in response:
+            raise RPCError(response["error"])
+        return response.get("result")
+
+    def _failover(self, ranked, body):
+        last_error = None
+        for endpoint in ranked:
+            try:
+                return self._post(endpoint, body)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def _hedged(self, ranked, body):
+        pending = {_HEDGE_POOL.submit(self._post, ranked[0], body)}
+        next_index = 1
+        last_error = None
+        while pending:
+            timeout = self.hedge_after if next_index < len(ranked) else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+            # Too slow, or every request in flight failed: bring in the next endpoint.
+            if next_index < len(ranked) and (not done or not pending):
+                pending.add(_HEDGE_POOL.submit(self._post, ranked[next_index], body))
+                next_index += 1
+        raise last_error
+
+    def _send_raw(self, ranked, body, params):
+        raw = params[0] if params else None
+        if raw is not None and not isinstance(raw, str):
+            raw = "0x" + bytes(raw).hex()
+        tx_hash = "0x" + keccak(hexstr=raw).hex() if raw else None
+        last_error = None
+        for i, endpoint in enumerate(ranked):
+            if i > 0 and tx_hash:
+                # The previous endpoint may have accepted it before failing.
+                try:
+                    if endpoint.transport.call("eth_getTransactionByHash", [tx_hash]) is not None:
+                        self._last_send = endpoint
+                        return {"jsonrpc": "2.0", "id": json.loads(body)["id"], "result": tx_hash}
+                except Exception as e:
+                    last_error = e
+                    continue
+            try:
+                response = self._post(endpoint, body)
+            except Exception as e:
+                last_error = e
+                continue
+            if "error" not in response or "already known" in str(response["error"]).lower():
+                self._last_send = endpoint
+            return response
+        raise last_error
+
+
+def _pending_nonce(method, params):
+    return method == "eth_getTransactionCount" and "pending" in list(params)[1:]
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(rpc_url):
+    """
+    Return the shared endpoint pool for a chain's RPC_URL value.
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.get(rpc_url)
+        if pool is None:
+            pool = _POOLS[rpc_url] = EndpointPool(rpc_url)
+        return pool
+
+
+class PooledHTTPProvider(JSONBaseProvider):
+    """
+    web3 provider that sends every request through the endpoint pool for a
+    chain's RPC_URL, so all Web3 objects on one chain share its keep-alive
+    connections, endpoint scores and failover.
+    """
+
+    def __init__(self, url):
+        super().__init__()
+        self.endpoint_uri = url
+        self.pool = get_pool(url)
+
+    def make_request(self, method, params):
+        return self.pool.post(method, self.encode_rpc_request(method, params), params)
+
+
+def account_snapshot(url, addresses):
+    """
+    Read chain id, head block, fee history and every address's pending nonce
+    and balance in one batch POST. Returns a dict; failed reads are RPCError.
+    """
+    calls = [
+        ("eth_chainId", []),
+        ("eth_blockNumber", []),
+        ("eth_feeHistory", [hex(20), "latest", [10, 50, 90]]),
+    ]
+    for address in addresses:
+        calls.append(("eth_getTransactionCount", [address, "pending"]))
+        calls.append(("eth_getBalance", [address, "latest"]))
+    results = get_pool(url).batch(calls)
+    snapshot = {
+        "chain_id": _int(results[0]),
+        "block": _int(results[1]),
+        "fee_history": results[2],
+        "accounts": {},
+    }
+    for i, address in enumerate(addresses):
+        snapshot["accounts"][address] = {
+            "nonce": _int(results[3 + 2 * i]),
+            "balance": _int(results[4 + 2 * i]),
+        }
+    return snapshot
+
+
+def _int(value):
+    return int(value, 16) if isinstance(value, str) else value
+
+
+def transport_stats():
+    with _TRANSPORTS_LOCK:
+        return {url: dict(t.stats) for url, t in _TRANSPORTS.items()}
+
+
+def print_rpc_stats():
+    stats = transport_stats()
+    if not stats:
+        return
+    print("\n=== RPC Endpoint Stats ===")
+    for url, s in sorted(stats.items()):
+        avg = s["seconds"] / s["requests"] * 1000 if s["requests"] else 0.0
+        print(f"{url}\n    {s['requests']} requests, {s['calls']} calls, {s['errors']} errors, "
+              f"avg {avg:.0f} ms, max {s['max_seconds'] * 1000:.0f} ms")
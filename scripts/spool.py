@@ -0,0 +1,184 @@
+import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from airdrop import iter_recipients
+from rpc import get_pool, RPCError
+
+SPOOL_VERSION = 1
+SIGN_CHUNK = 512        # transactions handed to the signing processes at a time
+
+_SIGNER = None
+
+
+def _init_signer(private_key):
+    global _SIGNER
+    from eth_account import Account
+    _SIGNER = Account.from_key(private_key)
+
+
+def _sign(tx):
+    signed = _SIGNER.sign_transaction(tx)
+    return "0x" + bytes(signed.rawTransaction).hex(), "0x" + bytes(signed.hash).hex()
+
+
+def read_spool(spool_path):
+    """
+    Return (header, entries) of a spool file. A partially written last line
+    (from an interrupted run) is ignored.
+    """
+    header, entries = None, []
+    with open(spool_path, "r") as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            if header is None:
+                header = item
+            else:
+                entries.append(item)
+    return header, entries
+
+
+def sign_spool(path, spool_path, private_key, sender, chain_id, to, encode, normalize, nonce, fees, gas, workers=None):
+    """
+    Stage one: sign a transaction for every row of a recipients file and
+    append it to spool_path, without any network access.
+
+    encode(recipients, amounts) returns the calldata for a chunk of rows
+    (every call goes to `to`), normalize(address) a checksum address or
+    None. Nonces count up from `nonce`, and every transaction gets the fixed
+    `fees` and `gas` limit.
+    Signing runs in a process pool. Re-running against an existing spool only
+    signs the rows it does not have yet, continuing after its last nonce.
+    Returns a dict with signed / skipped / invalid counts.
+    """
+    done = set()
+    if os.path.exists(spool_path):
+        header, entries = read_spool(spool_path)
+        if header and (header.get("chain_id") != chain_id or header.get("from", "").lower() != sender.lower()):
+            raise ValueError(f"{spool_path} was signed for chain {header.get('chain_id')} by {header.get('from')}")
+        done = {e["row"] for e in entries}
+        nonces = [e["nonce"] for e in entries if "nonce" in e]
+        if nonces:
+            nonce = max(nonces) + 1
+        out = open(spool_path, "a")
+        if header is None:
+            out.write(json.dumps({"spool": SPOOL_VERSION, "chain_id": chain_id, "from": sender}) + "\n")
+    else:
+        out = open(spool_path, "w")
+        out.write(json.dumps({"spool": SPOOL_VERSION, "chain_id": chain_id, "from": sender,
+                              "created_at": time.time()}) + "\n")
+
+    stats = {"signed": 0, "skipped": 0, "invalid": 0}
+    pending = []
+
+    def flush(pool):
+        calldata = encode([e["recipient"] for e in pending], [e["amount"] for e in pending])
+        txs = [dict(to=to, data=data, value=0, gas=gas, nonce=e["nonce"], chainId=chain_id, **fees)
+               for e, data in zip(pending, calldata)]
+        for entry, (raw, tx_hash) in zip(pending, pool.map(_sign, txs, chunksize=64)):
+            out.write(json.dumps(dict(entry, hash=tx_hash, raw=raw)) + "\n")
+        out.flush()
+        stats["signed"] += len(pending)
+        print(f"[+] {stats['signed']} transactions signed")
+        pending.clear()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_signer, initargs=(private_key,)) as pool:
+            for row, address, amount in iter_recipients(path):
+                if row in done:
+                    stats["skipped"] += 1
+                    continue
+                recipient = normalize(address)
+                if recipient is None or not amount.isdigit() or int(amount) <= 0:
+                    print(f"[!] Row {row}: invalid address or amount ({address}, {amount})")
+                    out.write(json.dumps({"row": row, "error": "invalid"}) + "\n")
+                    stats["invalid"] += 1
+                    continue
+                pending.append({"row": row, "nonce": nonce, "recipient": recipient, "amount": amount})
+                nonce += 1
+                if len(pending) >= SIGN_CHUNK:
+                    flush(pool)
+            if pending:
+                flush(pool)
+    finally:
+        out.close()
+    return stats
+
+
+def read_sent(results_path):
+    sent = set()
+    if os.path.exists(results_path):
+        with open(results_path, "r") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+                if item.get("status") == "sent":
+                    sent.add(item["hash"])
+    return sent
+
+
+def _classify(pool, entry, result):
+    if not isinstance(result, RPCError):
+        return "sent", None
+    message = result.message.lower()
+    if "already known" in message or "known transaction" in message:
+        return "sent", None
+    if "nonce too low" in message and pool.call("eth_getTransactionByHash", [entry["hash"]]) is not None:
+        return "sent", None
+    return "failed", result.message
+
+
+def broadcast_spool(spool_path, rpc_url, rate=None, batch_size=20, results_path=None, on_sent=None):
+    """
+    Stage two: send the signed transactions of a spool in nonce order, at
+    most `rate` per second, `batch_size` per JSON-RPC batch. Every result is
+    appended to results_path (default <spool>.sent), so a rerun skips what was
+    already accepted. Sending stops at the first rejected transaction, since
+    every later nonce would be stuck behind it; fix the cause and run again.
+    on_sent(entry) is called for every accepted transaction.
+    Returns a dict with sent / skipped / failed counts.
+    """
+    results_path = results_path or spool_path + ".sent"
+    header, entries = read_spool(spool_path)
+    if header is None or header.get("spool") != SPOOL_VERSION:
+        raise ValueError(f"{spool_path} is not a transaction spool")
+    already = read_sent(results_path)
+    todo = sorted((e for e in entries if "raw" in e and e["hash"] not in already), key=lambda e: e["nonce"])
+    stats = {"sent": 0, "skipped": len(already), "failed": 0}
+
+    pool = get_pool(rpc_url)
+    next_at = time.monotonic()
+    with open(results_path, "a") as out:
+        for i in range(0, len(todo), batch_size):
+            batch = todo[i:i + batch_size]
+            if rate:
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_at = max(next_at, time.monotonic()) + len(batch) / rate
+            try:
+                results = pool.batch([("eth_sendRawTransaction", [e["raw"]]) for e in batch])
+            except Exception as e:
+                print(f"[!] Broadcast interrupted at nonce {batch[0]['nonce']}: {e}")
+                stats["failed"] += 1
+                return stats
+            for entry, result in zip(batch, results):
+                status, error = _classify(pool, entry, result)
+                out.write(json.dumps({"row": entry["row"], "nonce": entry["nonce"], "hash": entry["hash"],
+                                      "status": status, "error": error, "at": time.time()}) + "\n")
+                out.flush()
+                if status != "sent":
+                    print(f"[!] Nonce {entry['nonce']} (row {entry['row']}) rejected: {error}")
+                    stats["failed"] += 1
+                    return stats
+                stats["sent"] += 1
+                if on_sent:
+                    on_sent(entry)
+            print(f"[+] {stats['sent']}/{len(todo)} transactions broadcast")
+    return stats
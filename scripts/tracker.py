@@ -0,0 +1,231 @@
+import time
+import threading
+from collections import defaultdict, deque
+
+from rpc import get_pool, RPCError
+
+FINAL_STATES = ("success", "reverted", "dropped")
+# Receipt fields kept once a transaction is final; logs and bloom are dropped.
+RECEIPT_FIELDS = ("status", "contractAddress", "blockNumber", "gasUsed", "transactionHash")
+
+
+class TrackedTx:
+    """
+    State of one submitted transaction as seen by the tracker.
+    """
+
+    def __init__(self, tx_hash, rpc_url, group=None, meta=None):
+        self.hash = tx_hash
+        self.rpc_url = rpc_url
+        self.group = group
+        self.meta = meta or {}
+        self.submitted_at = time.time()
+        self.sent_at = self.submitted_at   # last (re)broadcast
+        self.hashes = [tx_hash]            # the original and every replacement, oldest first
+        self.landed = None                 # the hash that was mined
+        self.status = "pending"      # pending -> mined -> success / reverted, or dropped
+        self.receipt = None
+        self.block_number = None
+        self.gas_used = None
+        self.confirmations = 0
+        self.mined = threading.Event()
+        self.final = threading.Event()
+
+    @property
+    def contract_address(self):
+        return self.receipt.get("contractAddress") if self.receipt else None
+
+    @property
+    def replaced(self):
+        return self.landed is not None and self.landed != self.hash
+
+
+class ReceiptTracker:
+    """
+    Background thread that follows submitted transactions until they are
+    final. Receipts for every pending hash on an endpoint are fetched in one
+    JSON-RPC batch per poll, together with the head block, so confirmation
+    depth costs no extra requests. A transaction that was replaced (same
+    nonce, higher fees) is followed under all of its hashes, and whichever
+    one is mined completes it.
+
+    A transaction is final once it has `confirmations` blocks on top of it
+    (success or reverted), or when it has no receipt after `drop_after`
+    seconds and the node no longer knows it (dropped). on_final(tx) is called
+    for every final transaction.
+
+    Final transactions keep only RECEIPT_FIELDS of their receipt. Grouped
+    ones are forgotten when wait_group returns them, ungrouped ones once
+    `keep_final` newer transactions have become final.
+    """
+
+    def __init__(self, confirmations=1, poll_interval=2.0, drop_after=600, batch_size=100, on_final=None,
+                 keep_final=1000):
+        self.confirmations = confirmations
+        self.poll_interval = poll_interval
+        self.drop_after = drop_after
+        self.batch_size = batch_size
+        self.on_final = on_final
+        self.keep_final = keep_final
+        self._pending = {}
+        self._all = {}
+        self._groups = defaultdict(list)
+        self._done = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def track(self, rpc_url, tx_hash, group=None, meta=None):
+        tx = TrackedTx(tx_hash, rpc_url, group, meta)
+        with self._lock:
+            self._pending[tx_hash] = tx
+            self._all[tx_hash] = tx
+            if group is not None:
+                self._groups[group].append(tx)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="receipt-tracker", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return tx
+
+    def get(self, tx_hash):
+        with self._lock:
+            return self._all.get(tx_hash)
+
+    def wait(self, tx_hash, timeout=None, until="final"):
+        """
+        Block until tx_hash is mined (until="mined") or final. Returns the
+        TrackedTx; raises TimeoutError if it did not get there in time.
+        """
+        tx = self.get(tx_hash)
+        if tx is None:
+            raise KeyError(f"{tx_hash} is not tracked")
+        event = tx.mined if until == "mined" else tx.final
+        if not event.wait(timeout):
+            raise TimeoutError(f"{tx_hash} still {tx.status} after {timeout}s")
+        return tx
+
+    def wait_group(self, group, timeout=None):
+        """
+        Block until every transaction in group is final, then forget the
+        group. Returns the list of TrackedTx; raises TimeoutError if the
+        deadline passes first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            txs = list(self._groups.get(group, []))
+        for tx in txs:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not tx.final.wait(remaining):
+                raise TimeoutError(f"group {group}: {tx.hash} still {tx.status}")
+        with self._lock:
+            for tx in self._groups.pop(group, []):
+                self._forget(tx)
+        return txs
+
+    def replace(self, tx_hash, new_hash):
+        """
+        Record new_hash as a replacement of the tracked tx_hash. Waiting on
+        either hash returns once one of the versions is final.
+        """
+        with self._lock:
+            tx = self._all[tx_hash]
+            tx.hashes.append(new_hash)
+            tx.sent_at = time.time()
+            self._all[new_hash] = tx
+        self._wakeup.set()
+        return tx
+
+    def stuck(self, older_than):
+        """
+        Pending transactions without a receipt whose last broadcast is more
+        than `older_than` seconds ago.
+        """
+        now = time.time()
+        with self._lock:
+            return [tx for tx in self._pending.values()
+                    if tx.status == "pending" and now - tx.sent_at > older_than]
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            with self._lock:
+                by_url = defaultdict(list)
+                for tx in self._pending.values():
+                    by_url[tx.rpc_url].append(tx)
+            for url, txs in by_url.items():
+                for i in range(0, len(txs), self.batch_size):
+                    try:
+                        self._poll(url, txs[i:i + self.batch_size])
+                    except Exception as e:
+                        print(f"[!] Receipt tracker: {url}: {e}")
+
+    def _poll(self, url, txs):
+        transport = get_pool(url)
+        versions = [(tx, list(tx.hashes)) for tx in txs]
+        results = transport.batch([("eth_blockNumber", [])] +
+                                  [("eth_getTransactionReceipt", [h]) for _, hashes in versions for h in hashes])
+        if isinstance(results[0], RPCError):
+            raise results[0]
+        head = int(results[0], 16)
+        now = time.time()
+        unseen = []
+        i = 1
+        for tx, hashes in versions:
+            receipts = results[i:i + len(hashes)]
+            i += len(hashes)
+            if all(isinstance(r, RPCError) for r in receipts):
+                continue
+            landed = next(((h, r) for h, r in zip(hashes, receipts) if r and not isinstance(r, RPCError)), None)
+            if landed is None:
+                tx.receipt = None
+                tx.landed = None
+                tx.confirmations = 0
+                if now - tx.sent_at > self.drop_after:
+                    unseen.append((tx, hashes))
+                continue
+            tx.landed, receipt = landed
+            tx.receipt = receipt
+            tx.block_number = int(receipt["blockNumber"], 16)
+            tx.gas_used = int(receipt["gasUsed"], 16)
+            tx.confirmations = head - tx.block_number + 1
+            if tx.status == "pending":
+                tx.status = "mined"
+            tx.mined.set()
+            if tx.confirmations >= self.confirmations:
+                self._finish(tx, "success" if int(receipt.get("status", "0x1"), 16) == 1 else "reverted")
+
+        if unseen:
+            lookups = transport.batch([("eth_getTransactionByHash", [h]) for _, hashes in unseen for h in hashes])
+            i = 0
+            for tx, hashes in unseen:
+                found = lookups[i:i + len(hashes)]
+                i += len(hashes)
+                if all(f is None for f in found):
+                    self._finish(tx, "dropped")
+
+    def _finish(self, tx, status):
+        tx.status = status
+        with self._lock:
+            self._pending.pop(tx.hash, None)
+        if self.on_final:
+            try:
+                self.on_final(tx)
+            except Exception as e:
+                print(f"[!] Receipt tracker callback failed for {tx.hash}: {e}")
+        if tx.receipt:
+            tx.receipt = {k: tx.receipt[k] for k in RECEIPT_FIELDS if k in tx.receipt}
+        tx.mined.set()
+        tx.final.set()
+        if tx.group is None:
+            with self._lock:
+                self._done.append(tx)
+                while len(self._done) > self.keep_final:
+                    self._forget(self._done.popleft())
+
+    def _forget(self, tx):
+        # Caller holds self._lock.
+        for h in tx.hashes:
+            if self._all.get(h) is tx:
+                del self._all[h]
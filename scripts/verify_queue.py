@@ -0,0 +1,123 @@
+import time
+import random
+import threading
+
+# Per-verifier limits: parallel verifications and minimum seconds between starts.
+VERIFIER_LIMITS = {
+    "sourcify": {"concurrency": 2, "min_interval": 1.0},
+    "etherscan": {"concurrency": 1, "min_interval": 0.5},  # free API keys allow ~2-5 calls/s
+}
+
+
+class VerifyQueue:
+    """
+    Background verification workers over the persistent verify_jobs table in
+    the registry.
+
+    Each verifier gets its own worker threads (its concurrency limit) and a
+    minimum interval between starts (its rate limit). verify(job) must return
+    True once the contract is verified; anything else is retried with
+    exponential backoff (base_delay * 2^attempts, with jitter, capped at
+    max_delay) until max_attempts is reached and the job is marked failed.
+    """
+
+    def __init__(self, registry, verify, limits=None, max_attempts=8, base_delay=30, max_delay=1800):
+        self.registry = registry
+        self.verify = verify
+        self.limits = limits or VERIFIER_LIMITS
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._last_start = {name: 0.0 for name in self.limits}
+        self._rate_locks = {name: threading.Lock() for name in self.limits}
+        self._busy = 0
+        self._busy_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._threads = []
+
+    def enqueue(self, chain, token_name, address, deployer, verifier, delay=0):
+        if verifier not in self.limits:
+            raise ValueError(f"unknown verifier '{verifier}'")
+        self.registry.enqueue_verification(chain, token_name, address, deployer, verifier, delay)
+        self.start()
+        self._wakeup.set()
+
+    def start(self):
+        if self._threads:
+            return
+        self.registry.requeue_running_verifications()
+        for verifier, limit in self.limits.items():
+            for i in range(limit["concurrency"]):
+                thread = threading.Thread(target=self._work, args=(verifier,),
+                                          name=f"verify-{verifier}-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def wait_idle(self, timeout=None):
+        """
+        Block until no job is running and none is queued to run before the
+        timeout. Jobs that fall due in the meantime (e.g. after the initial
+        enqueue delay) are waited for; only jobs whose next attempt lands
+        after the deadline stay queued in the registry. Returns True if the
+        queue went idle before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        due_by = None if timeout is None else time.time() + timeout
+        while True:
+            with self._busy_lock:
+                busy = self._busy
+            due = self.registry.next_verification_due(list(self.limits))
+            if not busy and (due is None or (due_by is not None and due > due_by)):
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.5)
+
+    def _throttle(self, verifier):
+        interval = self.limits[verifier]["min_interval"]
+        with self._rate_locks[verifier]:
+            wait = self._last_start[verifier] + interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_start[verifier] = time.monotonic()
+
+    def _work(self, verifier):
+        while True:
+            job = None
+            with self._busy_lock:
+                self._busy += 1
+            try:
+                job = self.registry.claim_verification(verifier)
+                if job is not None:
+                    self._throttle(verifier)
+                    self._run(job)
+            except Exception as e:
+                print(f"[!] Verification worker ({verifier}): {e}")
+            finally:
+                with self._busy_lock:
+                    self._busy -= 1
+            if job is None:
+                due = self.registry.next_verification_due([verifier])
+                delay = self.base_delay if due is None else min(max(due - time.time(), 0.1), self.base_delay)
+                self._wakeup.wait(delay)
+                self._wakeup.clear()
+
+    def _run(self, job):
+        attempts = job["attempts"] + 1
+        try:
+            ok = self.verify(job)
+            error = None if ok else "verification failed"
+        except Exception as e:
+            ok, error = False, str(e)
+
+        if ok:
+            self.registry.finish_verification(job["id"], "done", attempts)
+            print(f"[✓] Verified {job['token_name']} at {job['address']} on {job['chain']}")
+        elif attempts >= self.max_attempts:
+            self.registry.finish_verification(job["id"], "failed", attempts, error=error)
+            print(f"[!] Giving up verifying {job['address']} on {job['chain']} after {attempts} attempts: {error}")
+        else:
+            delay = min(self.base_delay * 2 ** (attempts - 1), self.max_delay) * random.uniform(0.8, 1.2)
+            self.registry.finish_verification(job["id"], "queued", attempts, time.time() + delay, error)
+            print(f"[!] Verification of {job['address']} on {job['chain']} failed (attempt {attempts}), "
+                  f"retrying in {delay:.0f}s")